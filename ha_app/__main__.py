@@ -25,7 +25,7 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from typing import Any, Callable, Mapping, NoReturn
+from typing import Any, Callable, Mapping
 
 import grpc
 
@@ -120,8 +120,11 @@ def disconnect_handler() -> None:
 
 
 def start_consistency_check_event_loop(
-    actions: Mapping[VRRPSession, Action], interval: int
-) -> NoReturn:
+    actions: Mapping[VRRPSession, Action],
+    interval: int,
+    *,
+    max_iterations: int | None = None,
+) -> None:
     """
     Enter the consistency check event loop.
 
@@ -129,10 +132,15 @@ def start_consistency_check_event_loop(
         The registered actions, which may be triggered as part of the checks.
     :param interval:
         How often to perform the consistency check in seconds.
+    :param max_iterations:
+        Maximum number of check iterations to run, unlimited if None.
+        Intended for use in testing.
     """
     logger.info("Starting consistency checks every %d seconds", interval)
     last_check_time = time.monotonic()
-    while True:
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        iterations += 1
         time_since_last_check = time.monotonic() - last_check_time
         sleep_time = max(1, interval - time_since_last_check)
         time.sleep(sleep_time)
@@ -297,7 +305,7 @@ def setup_logging() -> None:
     logging.getLogger("urllib3").setLevel(logging.INFO)
 
 
-def main(argv: list[str]) -> NoReturn:
+def main(argv: list[str]) -> None:
     """Main function for the app."""
     # No CLI args supported, just support help output and getting version.
     help_description = textwrap.dedent(
@@ -342,9 +350,15 @@ def shutdown_cleanup() -> None:
         TELEM_SERVER.stop(grace=1)
 
 
-if __name__ == "__main__":
+def run(argv: list[str]) -> None:
+    """
+    Run the app, handling exit from the main thread.
+
+    :param argv:
+        The CLI arguments (not including the program name).
+    """
     try:
-        main(sys.argv[1:])
+        main(argv)
     except KeyboardInterrupt:
         logger.info("Exiting on Ctrl+C")
         shutdown_cleanup()
@@ -353,3 +367,7 @@ if __name__ == "__main__":
         logger.exception("Exiting on unexpected error:")
         shutdown_cleanup()
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
@@ -38,6 +38,13 @@ from pydantic import AnyHttpUrl, Field
 from .types import ActionType
 
 
+try:
+    # The libyaml-backed loader is significantly faster where available.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -155,7 +162,7 @@ class Config(pydantic.BaseModel, extra=pydantic.Extra.forbid):
         """
         logger.debug("Reading config from file: %s", file)
         with open(file, "r", encoding="utf-8") as f:
-            return cls(**(yaml.safe_load(f) or {}))
+            return cls(**(yaml.load(f, Loader=SafeLoader) or {}))
 
     @pydantic.validator("groups")
     def one_action_per_group(cls, groups: list[GroupConfig]) -> list[GroupConfig]:
@@ -13,13 +13,24 @@
 # limitations under the License.
 
 import logging
+import os
+
+
+# Ensure a fast protobuf backend is used for telemetry message encoding.
+# Must be set before google.protobuf is first imported.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
 
 import pytest
+from google.protobuf.internal import api_implementation
 from python_on_whales import DockerClient as CtrClient
 
 from .utils import ROOT_DIR
 
 
+# Catch accidental fallback to the orders-of-magnitude slower pure-python
+# protobuf implementation.
+assert api_implementation.Type() in ("cpp", "upb"), api_implementation.Type()
+
 logger = logging.getLogger(__name__)
 
 
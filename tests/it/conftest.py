@@ -96,44 +96,17 @@ def minimal_config() -> str:
     return "groups: []"
 
 
-@pytest.fixture(scope="package")
-def config_volume(ctr_client: CtrClient) -> CtrVolume:
-    """Container volume for mounting in HA app config."""
-    name = f"ha_app_config__{time.time()}"
-    logger.debug("Creating HA app config volume with name %s", name)
-    volume = ctr_client.volume.create(name)
-    yield volume
-    logger.debug("Removing HA config volume %r", name)
-    try:
-        volume.remove()
-    except CtrException:
-        logger.warning("Failed to remove volume %r", name, exc_info=True)
-
-
-@pytest.fixture(scope="package")
-def config_volume_ctr(ctr_client: CtrClient, config_volume: CtrVolume) -> Container:
-    """
-    A simple container with the config volume mounted writable at /etc/ha_app/.
-    """
-    with utils.mount_volume(ctr_client, config_volume, "/etc/ha_app/") as vol_ctr:
-        yield vol_ctr
-
-
 @pytest.fixture(scope="package")
 def app(
     pytestconfig: pytest.Config,
     ctr_client: CtrClient,
     test_ha_image: CtrImage,
-    config_volume: CtrVolume,
-    config_volume_ctr: Container,
     data_volume: CtrVolume,
 ) -> HAApp:
     """An HA app object, providing a clean API for running the container."""
     return HAApp(
         ctr_client,
         test_ha_image,
-        config_volume,
-        config_volume_ctr,
         data_volume if pytestconfig.option.cov_it else None,
     )
 
@@ -223,8 +196,10 @@ def aws_metadata_service(
         cap_add=["NET_ADMIN"],
     )
 
+    running = utils.log_sentinel_condition(ctr, "Running on http://169.254.169.254:80")
+
     def ready_condition() -> bool:
-        if "Running on http://169.254.169.254:80" in ctr.logs():
+        if running():
             return True
         ctr.reload()
         if not ctr.state.running:
@@ -15,6 +15,7 @@
 import logging
 import textwrap
 
+import pytest
 from python_on_whales import Container
 
 from .utils import AWSEndpoint, HAApp
@@ -22,6 +23,11 @@ from .utils import AWSEndpoint, HAApp
 
 logger = logging.getLogger(__name__)
 
+# The IT modules share the docker bridge (notably the AWS metadata service's
+# fixed 169.254.169.254 address) and fixed image tags, so they must not run
+# concurrently on different xdist workers.
+pytestmark = pytest.mark.xdist_group("it")
+
 
 def test_invalid_device_index(
     app: HAApp,
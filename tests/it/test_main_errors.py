@@ -16,6 +16,7 @@ import datetime as dt
 import logging
 import textwrap
 
+import pytest
 from python_on_whales import Container
 
 from . import utils
@@ -24,6 +25,11 @@ from .utils import AWSEndpoint, HAApp, gRPCClient
 
 logger = logging.getLogger(__name__)
 
+# The IT modules share the docker bridge (notably the AWS metadata service's
+# fixed 169.254.169.254 address) and fixed image tags, so they must not run
+# concurrently on different xdist workers.
+pytestmark = pytest.mark.xdist_group("it")
+
 
 def test_general_invalid_config(app: HAApp):
     """Test for general invalid config - app exits."""
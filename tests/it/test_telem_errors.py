@@ -15,11 +15,18 @@
 import json
 import logging
 
+import pytest
+
 from .utils import HAApp, gRPCClient
 
 
 logger = logging.getLogger(__name__)
 
+# The IT modules share the docker bridge (notably the AWS metadata service's
+# fixed 169.254.169.254 address) and fixed image tags, so they must not run
+# concurrently on different xdist workers.
+pytestmark = pytest.mark.xdist_group("it")
+
 
 def test_unexpected_telem_msg_encoding_paths(
     app: HAApp,
@@ -19,6 +19,8 @@ __all__ = (
     "gRPCClient",
     "HAApp",
     "build_with_dockerfile",
+    "get_event_dispatcher",
+    "log_sentinel_condition",
     "mount_volume",
     "wait_for",
 )
@@ -26,9 +28,10 @@ __all__ = (
 import contextlib
 import json
 import logging
-import shlex
+import os
 import tempfile
 import textwrap
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Generator, Iterable, Mapping, Self
@@ -47,6 +50,138 @@ logger = logging.getLogger(__name__)
 IT_TEST_DIR = ROOT_DIR / "tests" / "it"
 
 
+# Event actions indicating a container has stopped: docker emits 'die',
+# podman emits 'died'.
+_DIE_ACTIONS = frozenset(("die", "died"))
+
+
+class _EventDispatcher:
+    """
+    Dispatcher for container state-change events.
+
+    A single 'docker events' subscription is shared by all waiters, avoiding
+    each waiter independently polling the docker daemon for container state.
+
+    The event wire format differs between docker and podman, so waiters must
+    treat the events as best-effort and keep a container state check (via
+    'Container.reload()') as a fallback.
+    """
+
+    def __init__(self, ctr_client: CtrClient):
+        """
+        :param ctr_client:
+            A python_on_whales container client.
+        """
+        self._ctr_client = ctr_client
+        self._lock = threading.Lock()
+        self._subscriptions: dict[tuple[str, str], threading.Event] = {}
+        self._thread = threading.Thread(
+            target=self._dispatch, name="ctr-event-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def subscribe(self, ctr_name: str, action: str) -> threading.Event:
+        """
+        Subscribe to a container event.
+
+        Subscribe before starting the container to avoid racing against the
+        event being emitted.
+
+        :param ctr_name:
+            The name of the container the event relates to.
+        :param action:
+            The docker event action to wait for, e.g. 'start' or 'die'
+            (podman's 'died' is normalised to 'die').
+        :return:
+            An event object that gets set when the container event arrives.
+        """
+        with self._lock:
+            return self._subscriptions.setdefault((ctr_name, action), threading.Event())
+
+    def _dispatch(self) -> None:
+        """Target function for the dispatch thread."""
+        try:
+            for event in self._ctr_client.system.events(filters={"type": "container"}):
+                self._handle_event(event)
+        except Exception:
+            # Don't die silently on unexpected event shapes - waiters fall
+            # back to polling container state.
+            logger.exception("Container event dispatch failed:")
+
+    def _handle_event(self, event: Any) -> None:
+        """Set the waiter subscribed to a container event, if there is one."""
+        # Docker reports the container name in Actor.Attributes and the event
+        # kind in Action; podman uses top-level Name and Status fields, which
+        # may not survive python_on_whales' event parsing at all. All fields
+        # are optional, so extract defensively.
+        ctr_name = None
+        if event.actor is not None and event.actor.attributes is not None:
+            ctr_name = event.actor.attributes.get("name")
+        if ctr_name is None:
+            ctr_name = getattr(event, "name", None)
+        action = event.action or getattr(event, "status", None)
+        if ctr_name is None or action is None:
+            return
+        if action in _DIE_ACTIONS:
+            action = "die"
+        with self._lock:
+            waiter = self._subscriptions.get((ctr_name, action))
+        if waiter is not None:
+            waiter.set()
+
+
+def log_sentinel_condition(ctr: Container, sentinel: str) -> Callable[[], bool]:
+    """
+    Return a condition function that looks for a sentinel in container logs.
+
+    Only log text produced since the previous call is searched, keeping each
+    poll O(new log bytes) rather than rescanning the whole log every time.
+
+    :param ctr:
+        The container whose logs to search.
+    :param sentinel:
+        The log text being waited for.
+    :return:
+        A condition function suitable for passing to 'wait_for()'.
+    """
+    cursor = 0
+    # Keep enough of the previous chunk to catch a sentinel that straddles
+    # two reads.
+    overlap = len(sentinel) - 1
+
+    def check() -> bool:
+        nonlocal cursor
+        logs = ctr.logs()
+        chunk = logs[max(cursor - overlap, 0) :]
+        cursor = len(logs)
+        return sentinel in chunk
+
+    return check
+
+
+_event_dispatchers: dict[int, _EventDispatcher] = {}
+
+
+def get_event_dispatcher(ctr_client: CtrClient) -> _EventDispatcher:
+    """
+    Get the event dispatcher associated with a container client.
+
+    The dispatcher is created on first use, with its single 'docker events'
+    subscription shared by all subsequent waiters.
+
+    :param ctr_client:
+        A python_on_whales container client.
+    :return:
+        The event dispatcher for the given client.
+    """
+    try:
+        return _event_dispatchers[id(ctr_client)]
+    except KeyError:
+        return _event_dispatchers.setdefault(
+            id(ctr_client), _EventDispatcher(ctr_client)
+        )
+
+
 class gRPCClient:
     """
     A gRPC client for sending gRPC messages.
@@ -134,6 +269,7 @@ class gRPCClient:
             )
         logger.debug("Running gRPC client with args: %s", args)
         ctr_name = f"grpc_client__{time.time()}"
+        exited = get_event_dispatcher(self._ctr_client).subscribe(ctr_name, "die")
         ctr = self._ctr_client.run(
             self._ctr_img,
             command=args,
@@ -143,12 +279,18 @@ class gRPCClient:
             networks=["bridge"],
         )
 
-        def ready_condition() -> bool:
+        def has_exited() -> bool:
+            # Prefer the dispatched event, but fall back to polling container
+            # state in case the event is missed (subscription startup race,
+            # or podman event shapes not being recognised).
+            if exited.is_set():
+                return True
             ctr.reload()
-            return ctr.state.running is False
+            return not ctr.state.running
 
         try:
-            wait_for("gRPC client to exit", ready_condition, 10, exc_type=None)
+            wait_for("gRPC client to exit", has_exited, 10, exc_type=None)
+            ctr.reload()
             if ctr.state.exit_code != 0 and not expect_error:
                 logs = ctr.logs()
                 raise Exception(
@@ -231,11 +373,12 @@ class gRPCClient:
             networks=["bridge"],
         )
 
-        def ready_condition() -> bool:
-            return "Messages sent, keeping connection open" in ctr.logs()
+        msgs_sent = log_sentinel_condition(
+            ctr, "Messages sent, keeping connection open"
+        )
 
         try:
-            wait_for("gRPC client to send messages", ready_condition, 20, exc_type=None)
+            wait_for("gRPC client to send messages", msgs_sent, 20, exc_type=None)
             ctr.reload()
             if not ctr.state.running:
                 raise Exception(
@@ -439,16 +582,6 @@ class AWSEndpoint:
 
     def _run_ctr(self) -> Container:
         """Run the mock endpoint container."""
-
-        def ready_condition() -> bool:
-            if "Initialisation complete" in ctr.logs():
-                return True
-            ctr.reload()
-            if not ctr.state.running:
-                raise Exception(
-                    f"AWS endpoint container exited unexpectedly:\n{ctr.logs()}"
-                )
-
         logger.info(f"Running mock AWS endpoint container...")
         name = f"aws_endpoint__{time.time()}"
         ctr = self._ctr_client.run(
@@ -458,6 +591,17 @@ class AWSEndpoint:
             init=True,
             networks=["bridge"],
         )
+        initialised = log_sentinel_condition(ctr, "Initialisation complete")
+
+        def ready_condition() -> bool:
+            if initialised():
+                return True
+            ctr.reload()
+            if not ctr.state.running:
+                raise Exception(
+                    f"AWS endpoint container exited unexpectedly:\n{ctr.logs()}"
+                )
+
         try:
             wait_for(
                 "AWS endpoint container startup",
@@ -485,8 +629,6 @@ class HAApp:
         self,
         ctr_client: CtrClient,
         image: CtrImage,
-        config_vol: CtrVolume,
-        config_vol_ctr: Container,
         coverage_vol: CtrVolume | None = None,
     ):
         """
@@ -494,18 +636,12 @@ class HAApp:
             A python_on_whales container client.
         :param image:
             The HA container image to run.
-        :param config_vol:
-            A volume containing HA app config.
-        :param config_vol_ctr:
-            A container with the config volume mounted.
         :param coverage_vol:
             Optional volume to mount read-write at /data for collecting code
             coverage.
         """
         self._ctr_client = ctr_client
         self._img = image
-        self._config_vol = config_vol
-        self._config_vol_ctr = config_vol_ctr
         self._coverage_vol = coverage_vol
         self._collect_coverage = bool(self._coverage_vol)
 
@@ -532,28 +668,22 @@ class HAApp:
             Whether to add a route to the AWS metadata service.
         """
 
-        def is_listening() -> bool:
-            if "Listening on port" in ctr.logs():
-                return True
-            ctr.reload()
-            if not ctr.state.running:
-                raise Exception(
-                    f"HA container exited unexpectedly:\n{ctr.logs(timestamps=True)}"
-                )
-
-        def has_exited() -> bool:
-            ctr.reload()
-            return not ctr.state.running
-
         volumes = []
+        config_file = None
         if config is not None:
-            self._config_vol_ctr.execute(
-                ["sh", "-c", f"echo {shlex.quote(config)} > /etc/ha_app/config.yaml"]
+            # Bind mount the config from a host tempfile, avoiding the two
+            # docker round-trips of writing it via a sidecar container.
+            config_file = tempfile.NamedTemporaryFile(
+                "w", prefix="ha_app_config__", suffix=".yaml"
             )
-            volumes.append((self._config_vol, "/etc/ha_app/", "ro"))
+            config_file.write(config)
+            config_file.flush()
+            os.chmod(config_file.name, 0o644)
+            volumes.append((config_file.name, "/etc/ha_app/config.yaml", "ro"))
         if self._coverage_vol:
             volumes.append((self._coverage_vol, "/data/", "rw"))
         name = f"ha_app__{time.time()}"
+        exited = get_event_dispatcher(self._ctr_client).subscribe(name, "die")
         logger.info("Starting HA container %s", name)
         ctr = self._ctr_client.run(
             self._img,
@@ -568,13 +698,39 @@ class HAApp:
                 "ADD_AWS_METADATA_ROUTE": str(int(aws_metadata_route)),
             },
         )
+        listening = log_sentinel_condition(ctr, "Listening on port")
+
+        def is_listening() -> bool:
+            if listening():
+                return True
+            ctr.reload()
+            if not ctr.state.running:
+                raise Exception(
+                    f"HA container exited unexpectedly:\n{ctr.logs(timestamps=True)}"
+                )
+
         try:
-            wait_for(
-                "HA container exit" if expect_exit else "HA container startup",
-                condition=has_exited if expect_exit else is_listening,
-                timeout=timeout,
-                exc_type=CtrException,
-            )
+            if expect_exit:
+
+                def has_exited() -> bool:
+                    # Prefer the dispatched event, but fall back to polling
+                    # container state in case the event is missed
+                    # (subscription startup race, or podman event shapes not
+                    # being recognised).
+                    if exited.is_set():
+                        return True
+                    ctr.reload()
+                    return not ctr.state.running
+
+                wait_for("HA container exit", has_exited, timeout, exc_type=None)
+                ctr.reload()
+            else:
+                wait_for(
+                    "HA container startup",
+                    is_listening,
+                    timeout,
+                    exc_type=CtrException,
+                )
             assert ctr.network_settings.ip_address is not None
             yield ctr
         finally:
@@ -584,6 +740,8 @@ class HAApp:
                 with contextlib.suppress(CtrException):
                     ctr.kill("SIGTERM")
             ctr.remove(force=True)
+            if config_file is not None:
+                config_file.close()
 
 
 def build_with_dockerfile(
@@ -668,24 +826,36 @@ def wait_for(
         None to not catch exceptions.
     """
     logger.info("Waiting up to %s seconds for %s", timeout, description)
-    exception: exc_type | None = None
-    end_time = time.monotonic() + timeout
-    ready = False
-    while True:
-        if exc_type:
+    exception: Exception | None = None
+
+    # Specialise the check function up front rather than branching on the
+    # loop-invariant 'exc_type' on every iteration.
+    if exc_type:
+
+        def check() -> bool:
+            nonlocal exception
             try:
-                ready = condition()
+                return condition()
             except exc_type as e:
                 exception = e
-        else:
-            ready = condition()
-        if ready:
+                return False
+
+    else:
+        check = condition
+
+    # Bind in local scope to avoid repeated attribute lookups in the loop.
+    monotonic = time.monotonic
+    sleep = time.sleep
+
+    end_time = monotonic() + timeout
+    while True:
+        if check():
             logger.debug("Ready condition met")
             return
-        if time.monotonic() >= end_time:
+        if monotonic() >= end_time:
             break
         logger.debug("Trying again in %s seconds...", interval)
-        time.sleep(interval)
+        sleep(interval)
 
     msg = f"Timed out after {timeout} seconds waiting for {description}"
     if exception:
@@ -0,0 +1,31 @@
+# Copyright 2023 Cisco Systems Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared fixtures for the unit tests."""
+
+from unittest import mock
+
+import pytest
+
+
+# Shared mock standing in for ha_app.aws.AWSClient. A module-level object so
+# that test modules can reference its attributes (e.g. the bound methods on
+# .return_value) when building parametrized testcases at collection time.
+aws_client_mock = mock.Mock()
+
+
+@pytest.fixture(scope="session")
+def aws_client_session() -> mock.Mock:
+    """The shared AWSClient mock, created once per session."""
+    return aws_client_mock
@@ -12,8 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextlib
 import logging
+import typing
 from ipaddress import IPv4Address, IPv4Network
+from types import SimpleNamespace
+from typing import Any
 from unittest import mock
 
 import botocore.exceptions
@@ -22,81 +27,206 @@ import requests
 
 from ha_app import aws
 
-
-@pytest.fixture(autouse=True)
-def boto3_client_create() -> mock.Mock:
-    with mock.patch("boto3.client") as m:
-        yield m
+from ..utils import parametrize_with_namedtuples
+
+
+# Canned IMDSv2 responses, shared by every client construction.
+_TOKEN_RESP = mock.Mock(text="test-token")
+_INSTANCE_ID_RESP = mock.Mock(text="test-instance-id")
+_REGION_RESP = mock.Mock(text="test-region")
+
+
+class _RequestStub:
+    """
+    Minimal stand-in for a 'requests' function, recording its calls.
+
+    A plain callable avoids the MagicMock call machinery on every HTTP
+    request made during client construction.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.responses: list[mock.Mock] = []
+        self.exc: type[Exception] | None = None
+
+    def __call__(self, url: str, **kwargs: Any) -> mock.Mock:
+        self.calls.append((url, kwargs))
+        if self.exc is not None:
+            raise self.exc
+        return self.responses.pop(0)
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.responses.clear()
+        self.exc = None
+
+
+def _clear_side_effects(m: mock.Mock, _visited: set[int] | None = None) -> None:
+    """
+    Clear side effects throughout a mock's tree of child mocks.
+
+    'reset_mock(side_effect=True)' is not used as it does not recurse into
+    return values (e.g. 'boto3_resource.RouteTable.return_value.create_route'),
+    and it clobbers the side effects implementing magic methods such as
+    'MagicMock.__iter__'.
+    """
+    if _visited is None:
+        _visited = set()
+    if id(m) in _visited:
+        return
+    _visited.add(id(m))
+    m.side_effect = None
+    ret = m.__dict__.get("_mock_return_value")
+    if isinstance(ret, mock.NonCallableMock):
+        _clear_side_effects(ret, _visited)
+    for name, child in m.__dict__.get("_mock_children", {}).items():
+        if name.startswith("__") and name.endswith("__"):
+            continue
+        if isinstance(child, mock.NonCallableMock):
+            _clear_side_effects(child, _visited)
+
+
+def _reset_mock_tree(m: mock.Mock) -> None:
+    """Reset a mock between tests, clearing recorded calls and side effects."""
+    m.reset_mock()
+    _clear_side_effects(m)
+
+
+def _reset_patches(patches: dict[str, Any]) -> None:
+    """Reset all the patched entrypoints between tests."""
+    for m in patches.values():
+        if isinstance(m, _RequestStub):
+            m.reset()
+        else:
+            _reset_mock_tree(m)
+
+
+# Patcher objects built once at import time rather than per fixture setup.
+_BOTO3_PATCHERS = {
+    target: mock.patch(target) for target in ("boto3.client", "boto3.resource")
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _patches() -> dict[str, Any]:
+    """Patch the boto3/requests entrypoints once for the whole session."""
+    patched: dict[str, Any] = {
+        target: patcher.start() for target, patcher in _BOTO3_PATCHERS.items()
+    }
+    monkeypatch = pytest.MonkeyPatch()
+    for func in ("put", "get"):
+        stub = _RequestStub()
+        monkeypatch.setattr(requests, func, stub)
+        patched[f"requests.{func}"] = stub
+    yield patched
+    monkeypatch.undo()
+    for patcher in _BOTO3_PATCHERS.values():
+        patcher.stop()
+
+
+@pytest.fixture(scope="session")
+def boto3_client_create(_patches: dict[str, Any]) -> mock.Mock:
+    return _patches["boto3.client"]
+
+
+@pytest.fixture(scope="session")
+def boto3_resource_create(_patches: dict[str, Any]) -> mock.Mock:
+    return _patches["boto3.resource"]
 
 
 @pytest.fixture
-def boto3_client(boto3_client_create: mock.Mock) -> mock.Mock:
-    return boto3_client_create.return_value
+def boto3_resource(boto3_resource_create: mock.Mock) -> mock.Mock:
+    return boto3_resource_create.return_value
 
 
-@pytest.fixture(autouse=True)
-def boto3_resource_create() -> mock.Mock:
-    with mock.patch("boto3.resource") as m:
-        yield m
+@pytest.fixture(scope="session")
+def requests_put(_patches: dict[str, Any]) -> _RequestStub:
+    return _patches["requests.put"]
 
 
-@pytest.fixture
-def boto3_resource(boto3_resource_create: mock.Mock) -> mock.Mock:
-    return boto3_resource_create.return_value
+@pytest.fixture(scope="session")
+def requests_get(_patches: dict[str, Any]) -> _RequestStub:
+    return _patches["requests.get"]
 
 
-@pytest.fixture
-def boto3_ec2_instance(boto3_resource_create: mock.Mock) -> mock.Mock:
-    return boto3_resource_create.return_value.Instance.return_value
+@pytest.fixture(autouse=True)
+def _reset_mocks(_patches: dict[str, Any]) -> None:
+    """Reset the session-scoped patches after each test."""
+    yield
+    _reset_patches(_patches)
 
 
-@pytest.fixture(autouse=True)
-def requests_put() -> mock.Mock:
-    with mock.patch("requests.put") as m:
-        yield m
+@pytest.fixture
+def aws_client(boto3_resource: mock.Mock) -> aws.AWSClient:
+    """
+    An AWSClient instance created without running the constructor.
 
+    The construction flow (IMDSv2 requests plus boto3 setup) is covered by
+    the test_create_client* tests; the method tests only need the
+    constructed state.
+    """
+    client = aws.AWSClient.__new__(aws.AWSClient)
+    client._ec2_resource = boto3_resource
+    client._ec2_instance = boto3_resource.Instance.return_value
+    client._ec2_instance_enis = {}
+    return client
 
-@pytest.fixture(autouse=True)
-def requests_get() -> mock.Mock:
-    with mock.patch("requests.get") as m:
-        yield m
+
+@pytest.fixture
+def enis(aws_client: aws.AWSClient) -> dict[int, mock.Mock]:
+    """Mock ENIs with device indices 2, 3 and 8, attached to the client."""
+    enis = {
+        idx: mock.Mock(
+            spec_set=[
+                "attachment",
+                "assign_private_ip_addresses",
+                "id",
+                "private_ip_addresses",
+                "reload",
+            ],
+            attachment={"DeviceIndex": idx},
+            private_ip_addresses=[],
+        )
+        for idx in (2, 3, 8)
+    }
+    aws_client._ec2_instance_enis = enis
+    return enis
 
 
 def test_create_client(
-    requests_get: mock.Mock,
-    requests_put: mock.Mock,
+    requests_get: _RequestStub,
+    requests_put: _RequestStub,
     boto3_client_create: mock.Mock,
     boto3_resource_create: mock.Mock,
+    monkeypatch: pytest.MonkeyPatch,
 ):
     """Test the initialisation of an AWSClient instance."""
-    requests_put.return_value = mock.Mock(text="test-token")
-    requests_get.side_effect = [
-        mock.Mock(text="test-instance-id"),
-        mock.Mock(text="test-region"),
-    ]
+    requests_put.responses = [_TOKEN_RESP]
+    requests_get.responses = [_INSTANCE_ID_RESP, _REGION_RESP]
+    instance = boto3_resource_create.return_value.Instance.return_value
+    instance_enis = [mock.Mock(attachment={"DeviceIndex": idx}) for idx in (0, 3)]
+    monkeypatch.setattr(instance, "network_interfaces", instance_enis, raising=False)
 
     client = aws.AWSClient(endpoint_url="https://aws-vpc.com")
 
-    requests_put.assert_called_once_with(
-        "http://169.254.169.254/latest/api/token",
-        headers=mock.ANY,
-        timeout=mock.ANY,
-    )
-    requests_get.assert_has_calls(
-        [
-            mock.call(
-                "http://169.254.169.254/latest/meta-data/instance-id",
-                headers={"X-aws-ec2-metadata-token": "test-token"},
-                timeout=mock.ANY,
-            ),
-            mock.call(
-                "http://169.254.169.254/latest/meta-data/placement/region",
-                headers={"X-aws-ec2-metadata-token": "test-token"},
-                timeout=mock.ANY,
+    assert requests_put.calls == [
+        (
+            "http://169.254.169.254/latest/api/token",
+            dict(
+                headers={"X-aws-ec2-metadata-token-ttl-seconds": "60"},
+                timeout=aws.AWS_METADATA_SERVICE_TIMEOUT,
             ),
-        ],
-        any_order=True,
-    )
+        )
+    ]
+    assert sorted(url for url, _ in requests_get.calls) == [
+        "http://169.254.169.254/latest/meta-data/instance-id",
+        "http://169.254.169.254/latest/meta-data/placement/region",
+    ]
+    for _, kwargs in requests_get.calls:
+        assert kwargs == dict(
+            headers={"X-aws-ec2-metadata-token": "test-token"},
+            timeout=aws.AWS_METADATA_SERVICE_TIMEOUT,
+        )
     boto3_client_create.assert_called_once_with(
         service_name="ec2",
         region_name="test-region",
@@ -112,47 +242,50 @@ def test_create_client(
     boto3_resource_create.return_value.Instance.assert_called_once_with(
         "test-instance-id"
     )
+    instance.load.assert_called_once_with()
+    # The ENI map must be keyed by each interface's attachment device index.
+    assert client._ec2_instance_enis == {0: instance_enis[0], 3: instance_enis[1]}
 
 
 def test_create_client_token_error(
-    requests_get: mock.Mock,
-    requests_put: mock.Mock,
+    requests_get: _RequestStub,
+    requests_put: _RequestStub,
     boto3_client_create: mock.Mock,
     boto3_resource_create: mock.Mock,
     caplog: pytest.LogCaptureFixture,
 ):
     """Test failure to get a token during initialisation of AWSClient."""
-    requests_put.side_effect = requests.RequestException
+    requests_put.exc = requests.RequestException
+    caplog.set_level(logging.WARNING, "ha_app.aws")
 
-    with caplog.at_level(logging.WARNING, "ha_app.aws"):
-        with pytest.raises(requests.RequestException):
-            aws.AWSClient(endpoint_url="https://aws-vpc.com")
+    with pytest.raises(requests.RequestException):
+        aws.AWSClient(endpoint_url="https://aws-vpc.com")
 
     assert len(caplog.records) >= 1
-    requests_put.assert_called_once_with(
-        "http://169.254.169.254/latest/api/token",
-        headers=mock.ANY,
-        timeout=mock.ANY,
-    )
-    requests_get.assert_not_called()
+    assert requests_put.calls == [
+        (
+            "http://169.254.169.254/latest/api/token",
+            dict(
+                headers={"X-aws-ec2-metadata-token-ttl-seconds": "60"},
+                timeout=aws.AWS_METADATA_SERVICE_TIMEOUT,
+            ),
+        )
+    ]
+    assert not requests_get.calls
     boto3_client_create.assert_not_called()
     boto3_resource_create.assert_not_called()
 
 
-def test_get_indexed_eni(boto3_ec2_instance: mock.Mock):
+def test_get_indexed_eni(aws_client: aws.AWSClient, enis: dict[int, mock.Mock]):
     """Test the AWSClient.get_indexed_eni() method."""
-    enis = {idx: mock.Mock(attachment={"DeviceIndex": idx}) for idx in (2, 3, 8)}
-    boto3_ec2_instance.network_interfaces = enis.values()
-
-    assert aws.AWSClient().get_indexed_eni(2) is enis[2]
+    assert aws_client.get_indexed_eni(2) is enis[2]
     with pytest.raises(ValueError, match=r"device index '999' not found"):
-        aws.AWSClient().get_indexed_eni(999)
+        aws_client.get_indexed_eni(999)
 
 
-def test_get_eni(boto3_resource: mock.Mock, boto3_ec2_instance: mock.Mock):
+def test_get_eni(aws_client: aws.AWSClient, boto3_resource: mock.Mock):
     """Test the AWSClient.get_eni() method."""
     mock_eni = boto3_resource.NetworkInterface.return_value
-    aws_client = aws.AWSClient()
 
     # Success case
     assert aws_client.get_eni("eni-123") is mock_eni
@@ -177,10 +310,9 @@ def test_get_eni(boto3_resource: mock.Mock, boto3_ec2_instance: mock.Mock):
         aws_client.get_eni("eni-999")
 
 
-def test_get_route_table(boto3_resource: mock.Mock):
+def test_get_route_table(aws_client: aws.AWSClient, boto3_resource: mock.Mock):
     """Test the AWSClient.get_route_table() method."""
     mock_rtb = boto3_resource.RouteTable.return_value
-    aws_client = aws.AWSClient()
 
     # Success case
     assert aws_client.get_route_table("rtb-123") is mock_rtb
@@ -208,13 +340,12 @@ def test_get_route_table(boto3_resource: mock.Mock):
 class TestAssignVIP:
     """Test the AWSClient.assign_vip() API."""
 
-    def test_no_precheck_success(self, boto3_ec2_instance: mock.Mock):
+    def test_no_precheck_success(
+        self, aws_client: aws.AWSClient, enis: dict[int, mock.Mock]
+    ):
         """Test with IPv4 address and precheck=False."""
-        enis = {idx: mock.Mock(attachment={"DeviceIndex": idx}) for idx in (2, 3, 8)}
-        boto3_ec2_instance.network_interfaces = enis.values()
-
-        aws.AWSClient().assign_vip(2, IPv4Address("1.2.3.4"), precheck=False)
-        aws.AWSClient().assign_vip(8, IPv4Address("8.0.0.254"), precheck=False)
+        aws_client.assign_vip(2, IPv4Address("1.2.3.4"), precheck=False)
+        aws_client.assign_vip(8, IPv4Address("8.0.0.254"), precheck=False)
 
         enis[2].assign_private_ip_addresses.assert_called_once_with(
             PrivateIpAddresses=["1.2.3.4"], AllowReassignment=True
@@ -226,21 +357,18 @@ class TestAssignVIP:
         for eni in enis.values():
             eni.reload.assert_not_called()
 
-    def test_precheck_success(self, boto3_ec2_instance: mock.Mock):
+    def test_precheck_success(
+        self, aws_client: aws.AWSClient, enis: dict[int, mock.Mock]
+    ):
         """Test with IPv4 address and precheck=True."""
-        enis = {
-            idx: mock.Mock(attachment={"DeviceIndex": idx}, private_ip_addresses=[])
-            for idx in (2, 3, 8)
-        }
         enis[2].private_ip_addresses = [{"PrivateIpAddress": "1.1.1.1"}]
         enis[8].private_ip_addresses = [
             {"PrivateIpAddress": "8.0.0.200"},
             {"PrivateIpAddress": "8.0.0.254"},
         ]
-        boto3_ec2_instance.network_interfaces = enis.values()
 
-        aws.AWSClient().assign_vip(2, IPv4Address("1.2.3.4"), precheck=True)
-        aws.AWSClient().assign_vip(8, IPv4Address("8.0.0.254"), precheck=True)
+        aws_client.assign_vip(2, IPv4Address("1.2.3.4"), precheck=True)
+        aws_client.assign_vip(8, IPv4Address("8.0.0.254"), precheck=True)
 
         enis[2].assign_private_ip_addresses.assert_called_once_with(
             PrivateIpAddresses=["1.2.3.4"], AllowReassignment=True
@@ -252,12 +380,80 @@ class TestAssignVIP:
         enis[3].reload.assert_not_called()
 
 
+# Boto3 client errors raised from the Route/RouteTable mocks. The same
+# instance can be raised repeatedly by 'Mock.side_effect'.
+_REPLACE_ROUTE_INVALID = botocore.exceptions.ClientError(
+    error_response={"Error": {"Code": "InvalidParameterValue"}},
+    operation_name="ReplaceRoute",
+)
+_REPLACE_ROUTE_UNEXPECTED = botocore.exceptions.ClientError(
+    error_response={"Error": {"Code": "Unexpected"}},
+    operation_name="ReplaceRoute",
+)
+_CREATE_ROUTE_EXISTS = botocore.exceptions.ClientError(
+    error_response={"Error": {"Code": "RouteAlreadyExists"}},
+    operation_name="CreateRoute",
+)
+_CREATE_ROUTE_UNEXPECTED = botocore.exceptions.ClientError(
+    error_response={"Error": {"Code": "Unexpected"}},
+    operation_name="CreateRoute",
+)
+
+
+class RouteErrorTestParams(typing.NamedTuple):
+    replace_side_effect: Any
+    create_side_effect: Any
+    exp_exception: type[Exception] | None
+    exp_replace_calls: int
+    exp_create_called: bool
+
+
+route_error_testcases = {
+    "create_route_success": RouteErrorTestParams(
+        replace_side_effect=_REPLACE_ROUTE_INVALID,
+        create_side_effect=None,
+        exp_exception=None,
+        exp_replace_calls=1,
+        exp_create_called=True,
+    ),
+    # The route already existing at the point it is being created can be
+    # caused by a race between two threads - replacing the route succeeds
+    # on the second attempt.
+    "route_exists_at_create": RouteErrorTestParams(
+        replace_side_effect=[
+            _REPLACE_ROUTE_INVALID,
+            None,
+        ],
+        create_side_effect=_CREATE_ROUTE_EXISTS,
+        exp_exception=None,
+        exp_replace_calls=2,
+        exp_create_called=True,
+    ),
+    "unexpected_replace_error": RouteErrorTestParams(
+        replace_side_effect=_REPLACE_ROUTE_UNEXPECTED,
+        create_side_effect=None,
+        exp_exception=botocore.exceptions.ClientError,
+        exp_replace_calls=1,
+        exp_create_called=False,
+    ),
+    "unexpected_create_error": RouteErrorTestParams(
+        replace_side_effect=_REPLACE_ROUTE_INVALID,
+        create_side_effect=_CREATE_ROUTE_UNEXPECTED,
+        exp_exception=botocore.exceptions.ClientError,
+        exp_replace_calls=1,
+        exp_create_called=True,
+    ),
+}
+
+
 class TestUpdateRouteTable:
     """Test the AWSClient.update_route_table() API."""
 
-    def test_no_precheck_replace_success(self, boto3_resource: mock.Mock):
+    def test_no_precheck_replace_success(
+        self, aws_client: aws.AWSClient, boto3_resource: mock.Mock
+    ):
         """Test with IPv4 route and no precheck."""
-        aws.AWSClient().update_route_table(
+        aws_client.update_route_table(
             "rtb-123", IPv4Network("1.2.3.0/24"), "eni-123", precheck=False
         )
 
@@ -265,47 +461,49 @@ class TestUpdateRouteTable:
         boto3_route = boto3_resource.Route.return_value
         boto3_route.replace.assert_called_once_with(NetworkInterfaceId="eni-123")
 
-    def test_precheck_replace_success(self, boto3_resource: mock.Mock):
+    def test_precheck_replace_success(
+        self, aws_client: aws.AWSClient, boto3_resource: mock.Mock
+    ):
         """Test with IPv4 route and precheck."""
-        route_tables = {
-            "rtb-1": mock.Mock(
+        empty_route_table = SimpleNamespace(routes=[])
+        route_tables = collections.defaultdict(lambda: empty_route_table)
+        route_tables |= {
+            "rtb-1": SimpleNamespace(
                 routes=[
-                    mock.Mock(
+                    SimpleNamespace(
                         destination_cidr_block="1.2.3.0/24",
                         network_interface_id="eni-123",
                     )
                 ]
             ),
-            "rtb-2": mock.Mock(
+            "rtb-2": SimpleNamespace(
                 routes=[
-                    mock.Mock(
+                    SimpleNamespace(
                         destination_cidr_block="1.2.3.0/24",
                         network_interface_id="eni-123",
                     ),
-                    mock.Mock(
+                    SimpleNamespace(
                         destination_cidr_block="8.8.8.0/24",
                         network_interface_id="eni-456",
                     ),
                 ]
             ),
         }
-        boto3_resource.RouteTable.side_effect = lambda id: route_tables.get(
-            id, mock.Mock(routes=[])
-        )
+        boto3_resource.RouteTable.side_effect = route_tables.__getitem__
 
-        aws.AWSClient().update_route_table(
+        aws_client.update_route_table(
             "rtb-1", IPv4Network("1.2.3.0/24"), "eni-123", precheck=True
         )
         boto3_resource.Route.assert_not_called()
         boto3_resource.reset_mock()
 
-        aws.AWSClient().update_route_table(
+        aws_client.update_route_table(
             "rtb-2", IPv4Network("8.8.8.0/24"), "eni-456", precheck=True
         )
         boto3_resource.Route.assert_not_called()
         boto3_resource.reset_mock()
 
-        aws.AWSClient().update_route_table(
+        aws_client.update_route_table(
             "rtb-2", IPv4Network("1.2.3.0/24"), "eni-456", precheck=True
         )
         boto3_resource.Route.assert_called_once_with("rtb-2", "1.2.3.0/24")
@@ -313,104 +511,41 @@ class TestUpdateRouteTable:
         boto3_route.replace.assert_called_once_with(NetworkInterfaceId="eni-456")
         boto3_resource.reset_mock()
 
-    def test_no_precheck_create_route_success(self, boto3_resource: mock.Mock):
-        """Test success creating the route."""
-        boto3_resource.Route.return_value.replace.side_effect = (
-            botocore.exceptions.ClientError(
-                error_response={"Error": {"Code": "InvalidParameterValue"}},
-                operation_name="ReplaceRoute",
-            )
-        )
-        aws.AWSClient().update_route_table(
-            "rtb-123", IPv4Network("1.2.3.0/24"), "eni-123", precheck=False
-        )
-        boto3_resource.Route.assert_called_once_with("rtb-123", "1.2.3.0/24")
-        boto3_resource.Route.return_value.replace.assert_called_once_with(
-            NetworkInterfaceId="eni-123"
-        )
-        boto3_resource.RouteTable.assert_called_once_with("rtb-123")
-        boto3_resource.RouteTable.return_value.create_route.assert_called_once_with(
-            DestinationCidrBlock="1.2.3.0/24", NetworkInterfaceId="eni-123"
-        )
-
-    def test_route_exists_at_create(self, boto3_resource: mock.Mock):
-        """
-        Test the route already existing at the point it is being created.
-        This can be caused by a race between two threads.
-        Replacing the route succeeds on the second attempt.
-        """
-        boto3_resource.Route.return_value.replace.side_effect = [
-            (
-                botocore.exceptions.ClientError(
-                    error_response={"Error": {"Code": "InvalidParameterValue"}},
-                    operation_name="ReplaceRoute",
-                )
-            ),
-            None,
-        ]
-        boto3_resource.RouteTable.return_value.create_route.side_effect = (
-            botocore.exceptions.ClientError(
-                error_response={"Error": {"Code": "RouteAlreadyExists"}},
-                operation_name="CreateRoute",
-            )
-        )
-        aws.AWSClient().update_route_table(
-            "rtb-123", IPv4Network("1.2.3.0/24"), "eni-123", precheck=False
-        )
-        boto3_resource.Route.assert_called_once_with("rtb-123", "1.2.3.0/24")
-        boto3_resource.Route.return_value.replace.assert_has_calls(
-            [
-                mock.call(NetworkInterfaceId="eni-123"),
-                mock.call(NetworkInterfaceId="eni-123"),
-            ]
-        )
-        boto3_resource.RouteTable.assert_called_once_with("rtb-123")
-        boto3_resource.RouteTable.return_value.create_route.assert_called_once_with(
-            DestinationCidrBlock="1.2.3.0/24", NetworkInterfaceId="eni-123"
-        )
+    @parametrize_with_namedtuples(route_error_testcases)
+    def test_route_errors(
+        self,
+        aws_client: aws.AWSClient,
+        boto3_resource: mock.Mock,
+        replace_side_effect: Any,
+        create_side_effect: Any,
+        exp_exception: type[Exception] | None,
+        exp_replace_calls: int,
+        exp_create_called: bool,
+    ):
+        """Test handling of boto3 client errors from ReplaceRoute/CreateRoute."""
+        boto3_route = boto3_resource.Route.return_value
+        boto3_route_table = boto3_resource.RouteTable.return_value
+        boto3_route.replace.side_effect = replace_side_effect
+        boto3_route_table.create_route.side_effect = create_side_effect
 
-    def test_unexpected_replace_error(self, boto3_resource: mock.Mock):
-        """Test unexpected boto3 client error from ReplaceRoute."""
-        boto3_resource.Route.return_value.replace.side_effect = (
-            botocore.exceptions.ClientError(
-                error_response={"Error": {"Code": "Unexpected"}},
-                operation_name="ReplaceRoute",
-            )
+        raises_ctx = (
+            pytest.raises(exp_exception) if exp_exception else contextlib.nullcontext()
         )
-        with pytest.raises(botocore.exceptions.ClientError):
-            aws.AWSClient().update_route_table(
+        with raises_ctx:
+            aws_client.update_route_table(
                 "rtb-123", IPv4Network("1.2.3.0/24"), "eni-123", precheck=False
             )
+
         boto3_resource.Route.assert_called_once_with("rtb-123", "1.2.3.0/24")
-        boto3_resource.Route.return_value.replace.assert_called_once_with(
-            NetworkInterfaceId="eni-123"
+        assert (
+            boto3_route.replace.call_args_list
+            == [mock.call(NetworkInterfaceId="eni-123")] * exp_replace_calls
         )
-        boto3_resource.RouteTable.assert_not_called()
-        boto3_resource.RouteTable.return_value.create_route.assert_not_called()
-
-    def test_unexpected_create_error(self, boto3_resource: mock.Mock):
-        """Test unexpected boto3 client error from CreateRoute."""
-        boto3_resource.Route.return_value.replace.side_effect = (
-            botocore.exceptions.ClientError(
-                error_response={"Error": {"Code": "InvalidParameterValue"}},
-                operation_name="ReplaceRoute",
+        if exp_create_called:
+            boto3_resource.RouteTable.assert_called_once_with("rtb-123")
+            boto3_route_table.create_route.assert_called_once_with(
+                DestinationCidrBlock="1.2.3.0/24", NetworkInterfaceId="eni-123"
             )
-        )
-        boto3_resource.RouteTable.return_value.create_route.side_effect = (
-            botocore.exceptions.ClientError(
-                error_response={"Error": {"Code": "Unexpected"}},
-                operation_name="CreateRoute",
-            )
-        )
-        with pytest.raises(botocore.exceptions.ClientError):
-            aws.AWSClient().update_route_table(
-                "rtb-123", IPv4Network("1.2.3.0/24"), "eni-123", precheck=False
-            )
-        boto3_resource.Route.assert_called_once_with("rtb-123", "1.2.3.0/24")
-        boto3_resource.Route.return_value.replace.assert_called_once_with(
-            NetworkInterfaceId="eni-123"
-        )
-        boto3_resource.RouteTable.assert_called_once_with("rtb-123")
-        boto3_resource.RouteTable.return_value.create_route.assert_called_once_with(
-            DestinationCidrBlock="1.2.3.0/24", NetworkInterfaceId="eni-123"
-        )
+        else:
+            boto3_resource.RouteTable.assert_not_called()
+            boto3_route_table.create_route.assert_not_called()
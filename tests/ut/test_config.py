@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
 import textwrap
 import typing
@@ -22,6 +23,12 @@ import pydantic
 import pytest
 import yaml
 
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 from ha_app.config import (
     ActionType,
     AWSActivateVIPActionConfig,
@@ -32,20 +39,68 @@ from ha_app.config import (
     GroupConfig,
 )
 
-from ..utils import parametrize_with_namedtuples
-
 
 logger = logging.getLogger(__name__)
 
 
+# Cached constructors for the IP values repeated across testcases.
+_ip = functools.lru_cache(maxsize=None)(IPv4Address)
+_net = functools.lru_cache(maxsize=None)(IPv4Network)
+
+
+def _load_config_dict(yaml_text: str) -> dict:
+    """
+    Parse testcase YAML once, at module import.
+
+    YAML parses a uniformly indented document the same as a flush-left
+    one, so the indented testcase literals don't need dedenting first.
+    """
+    return yaml.load(yaml_text, Loader=SafeLoader)
+
+
+def _vip_group(
+    xr_interface: str, vrid: int, device_index: int, vip: str
+) -> GroupConfig:
+    """Shorthand for an expected aws_activate_vip group config."""
+    return GroupConfig(
+        xr_interface=xr_interface,
+        vrid=vrid,
+        action=AWSActivateVIPActionConfig(
+            type=ActionType.AWS_ACTIVATE_VIP,
+            device_index=device_index,
+            vip=_ip(vip),
+        ),
+    )
+
+
+def _route_group(
+    xr_interface: str,
+    vrid: int,
+    route_table_id: str,
+    destination: str,
+    target_network_interface: str,
+) -> GroupConfig:
+    """Shorthand for an expected aws_update_route_table group config."""
+    return GroupConfig(
+        xr_interface=xr_interface,
+        vrid=vrid,
+        action=AWSUpdateRouteTableActionConfig(
+            type=ActionType.AWS_UPDATE_ROUTE_TABLE,
+            route_table_id=route_table_id,
+            destination=_net(destination),
+            target_network_interface=target_network_interface,
+        ),
+    )
+
+
 class ParseConfigTestParams(typing.NamedTuple):
-    input_config: str
+    input_dict: dict
     exp_config: Config
 
 
 parse_config_testcases = {
     "empty": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups: []
             """
@@ -62,7 +117,7 @@ parse_config_testcases = {
         ),
     ),
     "single_vip_ipv4": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/1
@@ -74,21 +129,11 @@ parse_config_testcases = {
             """
         ),
         exp_config=Config(
-            groups=[
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/1",
-                    vrid=1,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=1,
-                        vip=IPv4Address("10.0.2.100"),
-                    ),
-                )
-            ],
+            groups=[_vip_group("HundredGigE0/0/0/1", 1, 1, "10.0.2.100")],
         ),
     ),
     "single_route_ipv4": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -102,21 +147,18 @@ parse_config_testcases = {
         ),
         exp_config=Config(
             groups=[
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/2",
-                    vrid=2,
-                    action=AWSUpdateRouteTableActionConfig(
-                        type=ActionType.AWS_UPDATE_ROUTE_TABLE,
-                        route_table_id="rtb-ec081d94",
-                        destination=IPv4Network("10.0.2.0/24"),
-                        target_network_interface="eni-7c90349273e5a5db",
-                    ),
+                _route_group(
+                    "HundredGigE0/0/0/2",
+                    2,
+                    "rtb-ec081d94",
+                    "10.0.2.0/24",
+                    "eni-7c90349273e5a5db",
                 )
             ],
         ),
     ),
     "many_actions": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/1
@@ -155,58 +197,28 @@ parse_config_testcases = {
         ),
         exp_config=Config(
             groups=[
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/1",
-                    vrid=1,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=1,
-                        vip=IPv4Address("10.0.1.100"),
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/1",
-                    vrid=2,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=2,
-                        vip=IPv4Address("10.0.1.200"),
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/2",
-                    vrid=2,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=2,
-                        vip=IPv4Address("10.0.2.100"),
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/11",
-                    vrid=11,
-                    action=AWSUpdateRouteTableActionConfig(
-                        type=ActionType.AWS_UPDATE_ROUTE_TABLE,
-                        route_table_id="rtb-123",
-                        destination=IPv4Network("10.0.2.0/24"),
-                        target_network_interface="eni-7c90349273e5a5db",
-                    ),
+                _vip_group("HundredGigE0/0/0/1", 1, 1, "10.0.1.100"),
+                _vip_group("HundredGigE0/0/0/1", 2, 2, "10.0.1.200"),
+                _vip_group("HundredGigE0/0/0/2", 2, 2, "10.0.2.100"),
+                _route_group(
+                    "HundredGigE0/0/0/11",
+                    11,
+                    "rtb-123",
+                    "10.0.2.0/24",
+                    "eni-7c90349273e5a5db",
                 ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/12",
-                    vrid=12,
-                    action=AWSUpdateRouteTableActionConfig(
-                        type=ActionType.AWS_UPDATE_ROUTE_TABLE,
-                        route_table_id="rtb-456",
-                        destination=IPv4Network("22.22.0.0/20"),
-                        target_network_interface="eni-03d03cf989c6b48c",
-                    ),
+                _route_group(
+                    "HundredGigE0/0/0/12",
+                    12,
+                    "rtb-456",
+                    "22.22.0.0/20",
+                    "eni-03d03cf989c6b48c",
                 ),
             ],
         ),
     ),
     "aws_endpoint": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 aws:
@@ -226,7 +238,7 @@ parse_config_testcases = {
         ),
     ),
     "port": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 port: 1234
@@ -241,7 +253,7 @@ parse_config_testcases = {
         ),
     ),
     "consistency_check_interval": ParseConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 consistency_check_interval_seconds: 3
@@ -258,81 +270,87 @@ parse_config_testcases = {
 }
 
 
-@parametrize_with_namedtuples(parse_config_testcases)
-def test_parse_config(input_config: str, exp_config: Config):
-    parsed_config = Config(**yaml.safe_load(input_config))
-    assert parsed_config == exp_config
+@pytest.mark.parametrize(
+    "testcase",
+    list(parse_config_testcases.values()),
+    ids=list(parse_config_testcases),
+)
+def test_parse_config(testcase: ParseConfigTestParams):
+    parsed_config = Config.parse_obj(testcase.input_dict)
+    assert parsed_config == testcase.exp_config
 
 
 class InvalidConfigTestParams(typing.NamedTuple):
-    input_config: str
-    exp_regex: str
+    input_dict: dict
+    exp_loc: tuple
+    exp_msg: str
 
 
 invalid_config_testcases = {
     "groups_not_a_list": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups: {}
             """
         ),
-        exp_regex=r"\ngroups\n.*not a valid list",
+        exp_loc=("groups",),
+        exp_msg="not a valid list",
     ),
     "missing_groups": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global: {}
             """
         ),
-        exp_regex=r"\ngroups\n.*field required",
+        exp_loc=("groups",),
+        exp_msg="field required",
     ),
     "port_type": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 port: 1.2
             groups: []
             """
         ),
-        exp_regex=r"\nglobal -> port\n.*not a valid integer",
+        exp_loc=("global", "port"),
+        exp_msg="not a valid integer",
     ),
     "port_value": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 port: 123456789
             groups: []
             """
         ),
-        exp_regex=r"\nglobal -> port\n.*less than or equal to 65535",
+        exp_loc=("global", "port"),
+        exp_msg="less than or equal to 65535",
     ),
     "consistency_check_interval_type": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 consistency_check_interval_seconds: None
             groups: []
             """
         ),
-        exp_regex=(
-            r"\nglobal -> consistency_check_interval_seconds\n.*not a valid integer"
-        ),
+        exp_loc=("global", "consistency_check_interval_seconds"),
+        exp_msg="not a valid integer",
     ),
     "consistency_check_interval_value": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 consistency_check_interval_seconds: 0
             groups: []
             """
         ),
-        exp_regex=(
-            r"\nglobal -> consistency_check_interval_seconds\n"
-            r".*greater than or equal to 1"
-        ),
+        exp_loc=("global", "consistency_check_interval_seconds"),
+        exp_msg="greater than or equal to 1",
     ),
     "aws_endpoint_url_regex": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 aws:
@@ -340,13 +358,11 @@ invalid_config_testcases = {
             groups: []
             """
         ),
-        exp_regex=(
-            r"\nglobal -> aws -> ec2_private_endpoint_url\n"
-            r"\s+invalid or missing URL scheme"
-        ),
+        exp_loc=("global", "aws", "ec2_private_endpoint_url"),
+        exp_msg="invalid or missing URL scheme",
     ),
     "group_vrid_type": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -358,10 +374,11 @@ invalid_config_testcases = {
                     target_network_interface: eni-7c90349273e5a5db
             """
         ),
-        exp_regex=r"\ngroups -> 0 -> vrid\n.*not a valid integer",
+        exp_loc=("groups", 0, "vrid"),
+        exp_msg="not a valid integer",
     ),
     "group_vrid_value": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -373,10 +390,11 @@ invalid_config_testcases = {
                     target_network_interface: eni-7c90349273e5a5db
             """
         ),
-        exp_regex=r"\ngroups -> 0 -> vrid\n.*greater than or equal to 1",
+        exp_loc=("groups", 0, "vrid"),
+        exp_msg="greater than or equal to 1",
     ),
     "group_action_type": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -386,13 +404,11 @@ invalid_config_testcases = {
                     ignored_field: 1
             """
         ),
-        exp_regex=(
-            r"\ngroups -> 0 -> action -> type\n"
-            r".*value is not a valid enumeration member"
-        ),
+        exp_loc=("groups", 0, "action", "type"),
+        exp_msg="not a valid enumeration member",
     ),
     "activate_vip_device_index_value": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -403,12 +419,11 @@ invalid_config_testcases = {
                     vip: 1.2.3.4
             """
         ),
-        exp_regex=(
-            r"\ngroups -> 0 -> action -> device_index\n.*greater than or equal to 0"
-        ),
+        exp_loc=("groups", 0, "action", "device_index"),
+        exp_msg="greater than or equal to 0",
     ),
     "activate_vip_ip_addr": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -419,10 +434,11 @@ invalid_config_testcases = {
                     vip: 1.2.3
             """
         ),
-        exp_regex=(r"\ngroups -> 0 -> action -> vip\n.*not a valid IPv4 address"),
+        exp_loc=("groups", 0, "action", "vip"),
+        exp_msg="not a valid IPv4 address",
     ),
     "activate_vip_ip_addr_ipv6": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -433,10 +449,11 @@ invalid_config_testcases = {
                     vip: 10::1
             """
         ),
-        exp_regex=(r"\ngroups -> 0 -> action -> vip\n.*not a valid IPv4 address"),
+        exp_loc=("groups", 0, "action", "vip"),
+        exp_msg="not a valid IPv4 address",
     ),
     "update_route_table_destination_ipv6": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -448,12 +465,11 @@ invalid_config_testcases = {
                     target_network_interface: eni-7c90349273e5a5db
             """
         ),
-        exp_regex=(
-            r"\ngroups -> 0 -> action -> destination\n.*not a valid IPv4 network"
-        ),
+        exp_loc=("groups", 0, "action", "destination"),
+        exp_msg="not a valid IPv4 network",
     ),
     "update_route_table_missing_eni": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -464,31 +480,32 @@ invalid_config_testcases = {
                     destination: 10.0.2.0/24
             """
         ),
-        exp_regex=(
-            r"\ngroups -> 0 -> action -> target_network_interface\n.*field required"
-        ),
+        exp_loc=("groups", 0, "action", "target_network_interface"),
+        exp_msg="field required",
     ),
     "unrecognised_field": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             foo: 1
             groups: []
             """
         ),
-        exp_regex=r"\nfoo\n.*extra fields not permitted",
+        exp_loc=("foo",),
+        exp_msg="extra fields not permitted",
     ),
     "unrecognised_global_field": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             global:
                 foo: 1
             groups: []
             """
         ),
-        exp_regex=r"\nglobal -> foo\n.*extra fields not permitted",
+        exp_loc=("global", "foo"),
+        exp_msg="extra fields not permitted",
     ),
     "unrecognised_group_field": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -501,10 +518,11 @@ invalid_config_testcases = {
                 foo: 1
             """
         ),
-        exp_regex=r"\ngroups -> 0 -> foo\n.*extra fields not permitted",
+        exp_loc=("groups", 0, "foo"),
+        exp_msg="extra fields not permitted",
     ),
     "unrecognised_action_field": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/2
@@ -517,10 +535,11 @@ invalid_config_testcases = {
                     foo: 1
             """
         ),
-        exp_regex=r"\ngroups -> 0 -> action -> foo\n.*extra fields not permitted",
+        exp_loc=("groups", 0, "action", "foo"),
+        exp_msg="extra fields not permitted",
     ),
     "multiple_actions_on_single_group": InvalidConfigTestParams(
-        input_config=textwrap.dedent(
+        input_dict=_load_config_dict(
             """\
             groups:
               - xr_interface: HundredGigE0/0/0/1
@@ -538,21 +557,35 @@ invalid_config_testcases = {
                     target_network_interface: eni-7c90349273e5a5db
             """
         ),
-        exp_regex=r"\ngroups\n\s+Only one action allowed per VRRP group, got multiple for <xr_interface=HundredGigE0/0/0/1,vrid=1>",
+        exp_loc=("groups",),
+        exp_msg="Only one action allowed per VRRP group, got multiple for <xr_interface=HundredGigE0/0/0/1,vrid=1>",
     ),
 }
 
 
-@parametrize_with_namedtuples(invalid_config_testcases)
-def test_invalid_config(input_config: str, exp_regex: str):
-    with pytest.raises(pydantic.ValidationError, match=exp_regex) as exc_info:
-        Config(**yaml.safe_load(input_config))
-    logger.debug("Validation exception:\n%s", exc_info.value)
+@pytest.mark.parametrize(
+    "testcase",
+    list(invalid_config_testcases.values()),
+    ids=list(invalid_config_testcases),
+)
+def test_invalid_config(testcase: InvalidConfigTestParams):
+    try:
+        Config.parse_obj(testcase.input_dict)
+    except pydantic.ValidationError as exc:
+        logger.debug("Validation errors: %s", exc.errors())
+        assert any(
+            error["loc"] == testcase.exp_loc and testcase.exp_msg in error["msg"]
+            for error in exc.errors()
+        )
+    else:
+        pytest.fail("Expected a pydantic.ValidationError")
 
 
-def test_from_file(tmp_path: Path):
-    tmp_file = tmp_path / "config.yaml"
-    tmp_file.write_text(
+@pytest.fixture(scope="module")
+def config_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A config file on disk, written once for the module."""
+    path = tmp_path_factory.mktemp("cfg") / "config.yaml"
+    path.write_text(
         textwrap.dedent(
             """\
             global:
@@ -561,6 +594,10 @@ def test_from_file(tmp_path: Path):
             """
         )
     )
-    actual = Config.from_file(tmp_file)
+    return path
+
+
+def test_from_file(config_file: Path):
+    actual = Config.from_file(config_file)
     expected = Config(**{"global": GlobalConfig(port=1234), "groups": []})
     assert actual == expected
@@ -12,15 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import contextlib
+import functools
 import logging
 import re
-import runpy
-import signal
+import subprocess
+import time
 import typing
 from concurrent.futures import Future
 from ipaddress import IPv4Address, IPv4Network
-from types import FrameType
+from types import SimpleNamespace
 from typing import Any, Callable, Mapping
 from unittest import mock
 
@@ -38,48 +38,65 @@ from ha_app.config import (
 from ha_app.types import Action, ActionType, VRRPEvent, VRRPSession, VRRPState
 from tests.utils import parametrize_with_namedtuples
 
+from .conftest import aws_client_mock
+
 
 logger = logging.getLogger(__name__)
 
+# Intern VRRPSession instances: repeated construction is avoided and dict
+# lookups against vrrp_states hit the identity-comparison fast path.
+_session = functools.lru_cache(maxsize=None)(VRRPSession)
 
-@pytest.fixture
-def registered_actions() -> Mapping[VRRPSession, Action]:
+
+@pytest.fixture(scope="session", name="registered_actions")
+def registered_actions_session() -> Mapping[VRRPSession, Action]:
     return {
-        VRRPSession("GigabitEthernet0/0/0/0", 1): Action(
+        _session("GigabitEthernet0/0/0/0", 1): Action(
             ActionType.AWS_ACTIVATE_VIP, mock.Mock(), kwarg1=1
         ),
-        VRRPSession("HundredGigE0/0/0/1", 2): Action(
+        _session("HundredGigE0/0/0/1", 2): Action(
             ActionType.AWS_UPDATE_ROUTE_TABLE, mock.Mock()
         ),
     }
 
 
+@pytest.fixture(autouse=True)
+def _reset_registered_actions(registered_actions: Mapping[VRRPSession, Action]) -> None:
+    """Reset the action mocks mutated by tests (call history, side effects)."""
+    yield
+    for action in registered_actions.values():
+        action.func.reset_mock()
+        action.func.side_effect = None
+
+
 @pytest.fixture(autouse=True)
 def vrrp_states(
-    registered_actions: Mapping[VRRPSession, VRRPState]
+    monkeypatch: pytest.MonkeyPatch,
+    registered_actions: Mapping[VRRPSession, VRRPState],
 ) -> dict[VRRPSession, VRRPState]:
     mock_state = {k: VRRPState.INACTIVE for k in registered_actions}
-    with mock.patch.object(__main__, "VRRP_STATES", mock_state):
-        yield mock_state
+    monkeypatch.setattr(__main__, "VRRP_STATES", mock_state)
+    return mock_state
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_config() -> Config:
-    return Config(
+    # Fixed-shape test data, so use construct() to skip pydantic validation.
+    return Config.construct(
         groups=[
-            GroupConfig(
+            GroupConfig.construct(
                 xr_interface="HundredGigE0/0/0/1",
                 vrid=1,
-                action=AWSActivateVIPActionConfig(
+                action=AWSActivateVIPActionConfig.construct(
                     type=ActionType.AWS_ACTIVATE_VIP,
                     device_index=1,
                     vip=IPv4Address("10.0.2.100"),
                 ),
             ),
-            GroupConfig(
+            GroupConfig.construct(
                 xr_interface="HundredGigE0/0/0/2",
                 vrid=2,
-                action=AWSUpdateRouteTableActionConfig(
+                action=AWSUpdateRouteTableActionConfig.construct(
                     type=ActionType.AWS_UPDATE_ROUTE_TABLE,
                     route_table_id="rtb-55555",
                     destination=IPv4Network("10.0.2.0/24"),
@@ -90,46 +107,92 @@ def valid_config() -> Config:
     )
 
 
-aws_client_mock = mock.Mock()
-
-
 @pytest.fixture(autouse=True)
-def aws_client() -> mock.Mock:
-    with mock.patch("ha_app.aws.AWSClient", aws_client_mock):
-        yield aws_client_mock
-    aws_client_mock.reset_mock()
+def aws_client(
+    monkeypatch: pytest.MonkeyPatch, aws_client_session: mock.Mock
+) -> mock.Mock:
+    monkeypatch.setattr("ha_app.aws.AWSClient", aws_client_session)
+    yield aws_client_session
+    # Most tests never touch the AWS client, in which case there's nothing
+    # to reset. Only the class-call record is asserted on, so a shallow
+    # reset avoids reset_mock() recursing through the mock tree.
+    if aws_client_session.mock_calls:
+        aws_client_session.called = False
+        aws_client_session.call_count = 0
+        aws_client_session.call_args = None
+        aws_client_session.call_args_list.clear()
+        aws_client_session.mock_calls.clear()
 
 
 @pytest.fixture
-def alarm_as_ctrl_c():
-    """Set the alarm signal handler to raise KeyboardInterrupt."""
+def consistency_check_single_iteration(monkeypatch: pytest.MonkeyPatch) -> Callable:
+    """Run the consistency check event loop for a single iteration."""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return functools.partial(
+        __main__.start_consistency_check_event_loop, max_iterations=1
+    )
 
-    def alarm_handler(signum: int, frame: FrameType):
-        logger.debug("Received alarm (SIGALRM), simulating Ctrl+C")
-        raise KeyboardInterrupt
 
-    signal.signal(signal.SIGALRM, alarm_handler)
-    yield
-    signal.signal(signal.SIGALRM, signal.SIG_DFL)
+class _MessageCaptureHandler(logging.Handler):
+    """Log handler capturing formatted messages into a plain list."""
 
+    def __init__(self) -> None:
+        super().__init__(level=logging.WARNING)
+        self.messages: list[str] = []
 
-@pytest.fixture
-def consistency_check_single_iteration() -> Callable:
-    """Set up mocks such that the consistency check event loop only runs once."""
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
 
-    class MockEventLoopBreakout(Exception):
-        pass
 
-    def mocked_consistency_check(*args, **kwargs) -> None:
-        try:
-            __main__.start_consistency_check_event_loop(*args, **kwargs)
-        except MockEventLoopBreakout:
-            pass
-        else:
-            assert False
-
-    with mock.patch("time.sleep", side_effect=[None, MockEventLoopBreakout]):
-        yield mocked_consistency_check
+@pytest.fixture
+def ha_app_log_messages() -> list[str]:
+    """Capture ha_app warning/error log messages, without caplog overhead."""
+    handler = _MessageCaptureHandler()
+    ha_app_logger = logging.getLogger("ha_app")
+    ha_app_logger.addHandler(handler)
+    yield handler.messages
+    ha_app_logger.removeHandler(handler)
+
+
+class VRRPEventTestParams(typing.NamedTuple):
+    initial_state: VRRPState | None  # None means an unregistered session
+    event_state: VRRPState
+    exp_submit: bool
+    exp_final_state: VRRPState
+
+
+vrrp_event_testcases = {
+    "unregistered": VRRPEventTestParams(
+        initial_state=None,
+        event_state=VRRPState.ACTIVE,
+        exp_submit=False,
+        exp_final_state=VRRPState.INACTIVE,
+    ),
+    "go_inactive": VRRPEventTestParams(
+        initial_state=VRRPState.ACTIVE,
+        event_state=VRRPState.INACTIVE,
+        exp_submit=False,
+        exp_final_state=VRRPState.INACTIVE,
+    ),
+    "remain_inactive": VRRPEventTestParams(
+        initial_state=VRRPState.INACTIVE,
+        event_state=VRRPState.INACTIVE,
+        exp_submit=False,
+        exp_final_state=VRRPState.INACTIVE,
+    ),
+    "remain_active": VRRPEventTestParams(
+        initial_state=VRRPState.ACTIVE,
+        event_state=VRRPState.ACTIVE,
+        exp_submit=False,
+        exp_final_state=VRRPState.ACTIVE,
+    ),
+    "go_active": VRRPEventTestParams(
+        initial_state=VRRPState.INACTIVE,
+        event_state=VRRPState.ACTIVE,
+        exp_submit=True,
+        exp_final_state=VRRPState.ACTIVE,
+    ),
+}
 
 
 class TestVRRPHandler:
@@ -143,7 +206,7 @@ class TestVRRPHandler:
         self.thread_pool_full = False
 
     @pytest.fixture(autouse=True)
-    def mock_thread_submit(self) -> mock.Mock:
+    def mock_thread_submit(self, monkeypatch: pytest.MonkeyPatch) -> mock.Mock:
         """Mock the thread pool's submit method."""
 
         def fake_thread_submit(func: Callable, *args, **kwargs) -> Future:
@@ -151,88 +214,54 @@ class TestVRRPHandler:
                 func(*args, **kwargs)
             except Exception:
                 pass
-            return mock.Mock(
-                wraps=Future,
-                running=mock.Mock(return_value=not self.thread_pool_full),
-                done=mock.Mock(return_value=False),
+            # Only running() and done() are consumed, so a plain namespace
+            # is much cheaper than building Mocks for every submission.
+            return typing.cast(
+                Future,
+                SimpleNamespace(
+                    running=lambda: not self.thread_pool_full,
+                    done=lambda: False,
+                ),
             )
 
-        with mock.patch.object(
-            __main__.THREAD_POOL, "submit", side_effect=fake_thread_submit
-        ) as mock_submit:
-            yield mock_submit
-
-    def test_unregistered_event(
-        self,
-        vrrp_states: dict[VRRPSession, VRRPState],
-        registered_actions: Mapping[VRRPSession, Action],
-        mock_thread_submit: mock.Mock,
-    ):
-        """Test an event being received for an unregistered VRRP session."""
-        initial_state = vrrp_states.copy()
-        event = VRRPEvent(VRRPSession("foo", 0), VRRPState.ACTIVE)
-        __main__.vrrp_handler(event, actions=registered_actions)
-        mock_thread_submit.assert_not_called()
-        assert vrrp_states == initial_state
-
-    def test_go_inactive_event(
-        self,
-        vrrp_states: dict[VRRPSession, VRRPState],
-        registered_actions: Mapping[VRRPSession, Action],
-        mock_thread_submit: mock.Mock,
-    ):
-        """Test an inactive event being received for an active VRRP session."""
-        session = VRRPSession("GigabitEthernet0/0/0/0", 1)
-        vrrp_states[session] = VRRPState.ACTIVE
-        event = VRRPEvent(session, VRRPState.INACTIVE)
-        __main__.vrrp_handler(event, actions=registered_actions)
-        mock_thread_submit.assert_not_called()
-        assert vrrp_states[session] is VRRPState.INACTIVE
-
-    def test_remain_inactive_event(
-        self,
-        vrrp_states: dict[VRRPSession, VRRPState],
-        registered_actions: Mapping[VRRPSession, Action],
-        mock_thread_submit: mock.Mock,
-    ):
-        """Test an inactive event being received for an inactive VRRP session."""
-        session = VRRPSession("GigabitEthernet0/0/0/0", 1)
-        vrrp_states[session] = VRRPState.INACTIVE
-        event = VRRPEvent(session, VRRPState.INACTIVE)
-        __main__.vrrp_handler(event, actions=registered_actions)
-        mock_thread_submit.assert_not_called()
-        assert vrrp_states[session] is VRRPState.INACTIVE
-
-    def test_remain_active_event(
-        self,
-        vrrp_states: dict[VRRPSession, VRRPState],
-        registered_actions: Mapping[VRRPSession, Action],
-        mock_thread_submit: mock.Mock,
-    ):
-        """Test an active event being received for an active VRRP session."""
-        session = VRRPSession("GigabitEthernet0/0/0/0", 1)
-        vrrp_states[session] = VRRPState.ACTIVE
-        event = VRRPEvent(session, VRRPState.ACTIVE)
-        __main__.vrrp_handler(event, actions=registered_actions)
-        mock_thread_submit.assert_not_called()
-        assert vrrp_states[session] is VRRPState.ACTIVE
+        mock_submit = mock.Mock(side_effect=fake_thread_submit)
+        monkeypatch.setattr(__main__.THREAD_POOL, "submit", mock_submit)
+        return mock_submit
 
-    def test_go_active_event(
+    @parametrize_with_namedtuples(vrrp_event_testcases)
+    def test_state_transition(
         self,
         vrrp_states: dict[VRRPSession, VRRPState],
         registered_actions: Mapping[VRRPSession, Action],
         mock_thread_submit: mock.Mock,
+        initial_state: VRRPState | None,
+        event_state: VRRPState,
+        exp_submit: bool,
+        exp_final_state: VRRPState,
     ):
-        """Test an active event being received for an inactive VRRP session."""
-        session = VRRPSession("GigabitEthernet0/0/0/0", 1)
-        vrrp_states[session] = VRRPState.INACTIVE
-        event = VRRPEvent(session, VRRPState.ACTIVE)
+        """Test an event being received for each VRRP state transition."""
+        if initial_state is None:
+            # An unregistered session, expected to be ignored. Snapshot the
+            # states as a tuple - dict order is stable so this is enough to
+            # check nothing changed, without a dict copy and key hashing.
+            session = _session("foo", 0)
+            initial_states = tuple(vrrp_states.values())
+        else:
+            session = _session("GigabitEthernet0/0/0/0", 1)
+            vrrp_states[session] = initial_state
+        event = VRRPEvent(session, event_state)
         __main__.vrrp_handler(event, actions=registered_actions)
-        mock_thread_submit.assert_called_once()
-        registered_actions[session].func.assert_called_once_with(
-            kwarg1=1, precheck=False
-        )
-        assert vrrp_states[session] is VRRPState.ACTIVE
+        if exp_submit:
+            mock_thread_submit.assert_called_once()
+            registered_actions[session].func.assert_called_once_with(
+                kwarg1=1, precheck=False
+            )
+        else:
+            mock_thread_submit.assert_not_called()
+        if initial_state is None:
+            assert tuple(vrrp_states.values()) == initial_states
+        else:
+            assert vrrp_states[session] is exp_final_state
 
     def test_go_active_exception(
         self,
@@ -241,7 +270,7 @@ class TestVRRPHandler:
         mock_thread_submit: mock.Mock,
     ):
         """Test a go-active thread hitting an exception."""
-        session = VRRPSession("GigabitEthernet0/0/0/0", 1)
+        session = _session("GigabitEthernet0/0/0/0", 1)
         action = registered_actions[session]
         action.func: mock.Mock
         action.func.side_effect = Exception("Testing thread hitting exception!")
@@ -254,20 +283,20 @@ class TestVRRPHandler:
 
     def test_go_active_pool_full(
         self,
-        caplog: pytest.LogCaptureFixture,
+        ha_app_log_messages: list[str],
         vrrp_states: dict[VRRPSession, VRRPState],
         registered_actions: Mapping[VRRPSession, Action],
         mock_thread_submit: mock.Mock,
     ):
         """Test an active event being received for an inactive VRRP session."""
-        session = VRRPSession("GigabitEthernet0/0/0/0", 1)
+        session = _session("GigabitEthernet0/0/0/0", 1)
         vrrp_states[session] = VRRPState.INACTIVE
         event = VRRPEvent(session, VRRPState.ACTIVE)
         self.thread_pool_full = True
         __main__.vrrp_handler(event, actions=registered_actions)
         assert (
             "Thread pool for performing actions is full, go-active events may be delayed"
-            in caplog.messages
+            in ha_app_log_messages
         )
 
 
@@ -275,7 +304,7 @@ class TestDisconnectHandler:
     """Tests for the disconnect_handler() function."""
 
     def test_handler(self, vrrp_states: dict[VRRPSession, VRRPState]):
-        vrrp_states[VRRPSession("GigabitEthernet0/0/0/0", 1)] = VRRPState.ACTIVE
+        vrrp_states[_session("GigabitEthernet0/0/0/0", 1)] = VRRPState.ACTIVE
         __main__.disconnect_handler()
         assert all(s is VRRPState.INACTIVE for s in vrrp_states.values())
 
@@ -286,182 +315,195 @@ class GetActionsFromConfigTestParams(typing.NamedTuple):
     aws_client_kwargs: Mapping[str, Any] = {}
 
 
-get_actions_from_config_testcases = {
-    "empty": GetActionsFromConfigTestParams(
-        input_config=Config(groups=[]), exp_actions={}
-    ),
-    "single_vip": GetActionsFromConfigTestParams(
-        input_config=Config(
-            groups=[
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/1",
-                    vrid=1,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=1,
-                        vip=IPv4Address("10.0.2.100"),
-                    ),
-                )
-            ],
+@functools.cache
+def _get_actions_from_config_testcases() -> dict[str, GetActionsFromConfigTestParams]:
+    """Build the testcases lazily, only when the test is parametrized."""
+    return {
+        "empty": GetActionsFromConfigTestParams(
+            input_config=Config(groups=[]), exp_actions={}
         ),
-        exp_actions={
-            VRRPSession("HundredGigE0/0/0/1", 1): Action(
-                ActionType.AWS_ACTIVATE_VIP,
-                aws_client_mock.return_value.assign_vip,
-                device_index=1,
-                ip_addr=IPv4Address("10.0.2.100"),
-            )
-        },
-    ),
-    "single_route": GetActionsFromConfigTestParams(
-        input_config=Config(
-            groups=[
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/2",
-                    vrid=2,
-                    action=AWSUpdateRouteTableActionConfig(
-                        type=ActionType.AWS_UPDATE_ROUTE_TABLE,
-                        route_table_id="rtb-ec081d94",
-                        destination=IPv4Network("10.0.2.0/24"),
-                        target_network_interface="eni-7c90349273e5a5db",
-                    ),
+        "single_vip": GetActionsFromConfigTestParams(
+            input_config=Config(
+                groups=[
+                    GroupConfig(
+                        xr_interface="HundredGigE0/0/0/1",
+                        vrid=1,
+                        action=AWSActivateVIPActionConfig(
+                            type=ActionType.AWS_ACTIVATE_VIP,
+                            device_index=1,
+                            vip=IPv4Address("10.0.2.100"),
+                        ),
+                    )
+                ],
+            ),
+            exp_actions={
+                _session("HundredGigE0/0/0/1", 1): Action(
+                    ActionType.AWS_ACTIVATE_VIP,
+                    aws_client_mock.return_value.assign_vip,
+                    device_index=1,
+                    ip_addr=IPv4Address("10.0.2.100"),
                 )
-            ],
-        ),
-        exp_actions={
-            VRRPSession("HundredGigE0/0/0/2", 2): Action(
-                ActionType.AWS_UPDATE_ROUTE_TABLE,
-                aws_client_mock.return_value.update_route_table,
-                route_table_id="rtb-ec081d94",
-                destination=IPv4Network("10.0.2.0/24"),
-                target_network_interface="eni-7c90349273e5a5db",
-            )
-        },
-    ),
-    "many": GetActionsFromConfigTestParams(
-        input_config=Config(
-            groups=[
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/1",
-                    vrid=1,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=1,
-                        vip=IPv4Address("10.0.1.100"),
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/1",
-                    vrid=2,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=2,
-                        vip=IPv4Address("10.0.1.200"),
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/2",
-                    vrid=2,
-                    action=AWSActivateVIPActionConfig(
-                        type=ActionType.AWS_ACTIVATE_VIP,
-                        device_index=2,
-                        vip=IPv4Address("10.0.2.100"),
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/11",
-                    vrid=11,
-                    action=AWSUpdateRouteTableActionConfig(
-                        type=ActionType.AWS_UPDATE_ROUTE_TABLE,
-                        route_table_id="rtb-123",
-                        destination=IPv4Network("10.0.2.0/24"),
-                        target_network_interface="eni-7c90349273e5a5db",
-                    ),
-                ),
-                GroupConfig(
-                    xr_interface="HundredGigE0/0/0/12",
-                    vrid=12,
-                    action=AWSUpdateRouteTableActionConfig(
-                        type=ActionType.AWS_UPDATE_ROUTE_TABLE,
-                        route_table_id="rtb-456",
-                        destination=IPv4Network("22.22.0.0/20"),
-                        target_network_interface="eni-03d03cf989c6b48c",
-                    ),
-                ),
-            ],
+            },
         ),
-        exp_actions={
-            VRRPSession("HundredGigE0/0/0/1", 1): Action(
-                ActionType.AWS_ACTIVATE_VIP,
-                aws_client_mock.return_value.assign_vip,
-                device_index=1,
-                ip_addr=IPv4Address("10.0.1.100"),
-            ),
-            VRRPSession("HundredGigE0/0/0/1", 2): Action(
-                ActionType.AWS_ACTIVATE_VIP,
-                aws_client_mock.return_value.assign_vip,
-                device_index=2,
-                ip_addr=IPv4Address("10.0.1.200"),
-            ),
-            VRRPSession("HundredGigE0/0/0/2", 2): Action(
-                ActionType.AWS_ACTIVATE_VIP,
-                aws_client_mock.return_value.assign_vip,
-                device_index=2,
-                ip_addr=IPv4Address("10.0.2.100"),
-            ),
-            VRRPSession("HundredGigE0/0/0/11", 11): Action(
-                ActionType.AWS_UPDATE_ROUTE_TABLE,
-                aws_client_mock.return_value.update_route_table,
-                route_table_id="rtb-123",
-                destination=IPv4Network("10.0.2.0/24"),
-                target_network_interface="eni-7c90349273e5a5db",
-            ),
-            VRRPSession("HundredGigE0/0/0/12", 12): Action(
-                ActionType.AWS_UPDATE_ROUTE_TABLE,
-                aws_client_mock.return_value.update_route_table,
-                route_table_id="rtb-456",
-                destination=IPv4Network("22.22.0.0/20"),
-                target_network_interface="eni-03d03cf989c6b48c",
-            ),
-        },
-    ),
-    "aws_endpoint": GetActionsFromConfigTestParams(
-        input_config=Config(
-            **{
-                "global": GlobalConfig(
-                    aws=AWSConfig(
-                        ec2_private_endpoint_url="https://vpce-1234.ec2.us-west-2.vpce.amazonaws.com"
+        "single_route": GetActionsFromConfigTestParams(
+            input_config=Config(
+                groups=[
+                    GroupConfig(
+                        xr_interface="HundredGigE0/0/0/2",
+                        vrid=2,
+                        action=AWSUpdateRouteTableActionConfig(
+                            type=ActionType.AWS_UPDATE_ROUTE_TABLE,
+                            route_table_id="rtb-ec081d94",
+                            destination=IPv4Network("10.0.2.0/24"),
+                            target_network_interface="eni-7c90349273e5a5db",
+                        ),
                     )
-                ),
-                "groups": [
+                ],
+            ),
+            exp_actions={
+                _session("HundredGigE0/0/0/2", 2): Action(
+                    ActionType.AWS_UPDATE_ROUTE_TABLE,
+                    aws_client_mock.return_value.update_route_table,
+                    route_table_id="rtb-ec081d94",
+                    destination=IPv4Network("10.0.2.0/24"),
+                    target_network_interface="eni-7c90349273e5a5db",
+                )
+            },
+        ),
+        "many": GetActionsFromConfigTestParams(
+            input_config=Config(
+                groups=[
                     GroupConfig(
                         xr_interface="HundredGigE0/0/0/1",
                         vrid=1,
                         action=AWSActivateVIPActionConfig(
                             type=ActionType.AWS_ACTIVATE_VIP,
                             device_index=1,
+                            vip=IPv4Address("10.0.1.100"),
+                        ),
+                    ),
+                    GroupConfig(
+                        xr_interface="HundredGigE0/0/0/1",
+                        vrid=2,
+                        action=AWSActivateVIPActionConfig(
+                            type=ActionType.AWS_ACTIVATE_VIP,
+                            device_index=2,
+                            vip=IPv4Address("10.0.1.200"),
+                        ),
+                    ),
+                    GroupConfig(
+                        xr_interface="HundredGigE0/0/0/2",
+                        vrid=2,
+                        action=AWSActivateVIPActionConfig(
+                            type=ActionType.AWS_ACTIVATE_VIP,
+                            device_index=2,
                             vip=IPv4Address("10.0.2.100"),
                         ),
-                    )
+                    ),
+                    GroupConfig(
+                        xr_interface="HundredGigE0/0/0/11",
+                        vrid=11,
+                        action=AWSUpdateRouteTableActionConfig(
+                            type=ActionType.AWS_UPDATE_ROUTE_TABLE,
+                            route_table_id="rtb-123",
+                            destination=IPv4Network("10.0.2.0/24"),
+                            target_network_interface="eni-7c90349273e5a5db",
+                        ),
+                    ),
+                    GroupConfig(
+                        xr_interface="HundredGigE0/0/0/12",
+                        vrid=12,
+                        action=AWSUpdateRouteTableActionConfig(
+                            type=ActionType.AWS_UPDATE_ROUTE_TABLE,
+                            route_table_id="rtb-456",
+                            destination=IPv4Network("22.22.0.0/20"),
+                            target_network_interface="eni-03d03cf989c6b48c",
+                        ),
+                    ),
                 ],
-            }
+            ),
+            exp_actions={
+                _session("HundredGigE0/0/0/1", 1): Action(
+                    ActionType.AWS_ACTIVATE_VIP,
+                    aws_client_mock.return_value.assign_vip,
+                    device_index=1,
+                    ip_addr=IPv4Address("10.0.1.100"),
+                ),
+                _session("HundredGigE0/0/0/1", 2): Action(
+                    ActionType.AWS_ACTIVATE_VIP,
+                    aws_client_mock.return_value.assign_vip,
+                    device_index=2,
+                    ip_addr=IPv4Address("10.0.1.200"),
+                ),
+                _session("HundredGigE0/0/0/2", 2): Action(
+                    ActionType.AWS_ACTIVATE_VIP,
+                    aws_client_mock.return_value.assign_vip,
+                    device_index=2,
+                    ip_addr=IPv4Address("10.0.2.100"),
+                ),
+                _session("HundredGigE0/0/0/11", 11): Action(
+                    ActionType.AWS_UPDATE_ROUTE_TABLE,
+                    aws_client_mock.return_value.update_route_table,
+                    route_table_id="rtb-123",
+                    destination=IPv4Network("10.0.2.0/24"),
+                    target_network_interface="eni-7c90349273e5a5db",
+                ),
+                _session("HundredGigE0/0/0/12", 12): Action(
+                    ActionType.AWS_UPDATE_ROUTE_TABLE,
+                    aws_client_mock.return_value.update_route_table,
+                    route_table_id="rtb-456",
+                    destination=IPv4Network("22.22.0.0/20"),
+                    target_network_interface="eni-03d03cf989c6b48c",
+                ),
+            },
         ),
-        exp_actions={
-            VRRPSession("HundredGigE0/0/0/1", 1): Action(
-                ActionType.AWS_ACTIVATE_VIP,
-                aws_client_mock.return_value.assign_vip,
-                device_index=1,
-                ip_addr=IPv4Address("10.0.2.100"),
-            )
-        },
-        aws_client_kwargs=dict(
-            endpoint_url="https://vpce-1234.ec2.us-west-2.vpce.amazonaws.com"
+        "aws_endpoint": GetActionsFromConfigTestParams(
+            input_config=Config(
+                **{
+                    "global": GlobalConfig(
+                        aws=AWSConfig(
+                            ec2_private_endpoint_url="https://vpce-1234.ec2.us-west-2.vpce.amazonaws.com"
+                        )
+                    ),
+                    "groups": [
+                        GroupConfig(
+                            xr_interface="HundredGigE0/0/0/1",
+                            vrid=1,
+                            action=AWSActivateVIPActionConfig(
+                                type=ActionType.AWS_ACTIVATE_VIP,
+                                device_index=1,
+                                vip=IPv4Address("10.0.2.100"),
+                            ),
+                        )
+                    ],
+                }
+            ),
+            exp_actions={
+                _session("HundredGigE0/0/0/1", 1): Action(
+                    ActionType.AWS_ACTIVATE_VIP,
+                    aws_client_mock.return_value.assign_vip,
+                    device_index=1,
+                    ip_addr=IPv4Address("10.0.2.100"),
+                )
+            },
+            aws_client_kwargs=dict(
+                endpoint_url="https://vpce-1234.ec2.us-west-2.vpce.amazonaws.com"
+            ),
         ),
-    ),
-}
+    }
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize test_parse_config, building its testcases on demand."""
+    if metafunc.definition.name == "test_parse_config":
+        testcases = _get_actions_from_config_testcases()
+        metafunc.parametrize(
+            GetActionsFromConfigTestParams._fields,
+            list(testcases.values()),
+            ids=list(testcases),
+        )
 
 
-@parametrize_with_namedtuples(get_actions_from_config_testcases)
 def test_parse_config(
     input_config: Config,
     exp_actions: Mapping[VRRPSession, Action],
@@ -481,7 +523,7 @@ def test_consistency_check_success(
     consistency_check_single_iteration,
 ) -> None:
     """Test the consistency check event loop in success flow."""
-    session = VRRPSession("GigabitEthernet0/0/0/0", 1)
+    session = _session("GigabitEthernet0/0/0/0", 1)
     vrrp_states[session] = VRRPState.ACTIVE
     action = registered_actions[session]
 
@@ -491,201 +533,174 @@ def test_consistency_check_success(
 
 
 def test_consistency_check_error(
-    caplog: pytest.LogCaptureFixture,
+    ha_app_log_messages: list[str],
     registered_actions: Mapping[VRRPSession, Action],
     vrrp_states: dict[VRRPSession, VRRPState],
     consistency_check_single_iteration,
 ) -> None:
     """Test the consistency check event loop in error performing action."""
 
-    session = VRRPSession("GigabitEthernet0/0/0/0", 1)
+    session = _session("GigabitEthernet0/0/0/0", 1)
     vrrp_states[session] = VRRPState.ACTIVE
     action = registered_actions[session]
     action.func.side_effect = Exception("Test-induced exception!")
 
-    with caplog.at_level(logging.ERROR, logger="ha_app"):
-        consistency_check_single_iteration(registered_actions, 10)
+    consistency_check_single_iteration(registered_actions, 10)
 
     action.func.assert_called_once_with(kwarg1=1, precheck=True)
-    assert len(caplog.records) == 1
-    assert caplog.messages[0] == (
+    assert ha_app_log_messages == [
         "Hit an error trying to perform consistency check action "
         "'aws_activate_vip' on <xr_interface=GigabitEthernet0/0/0/0,vrid=1>"
-    )
+    ]
 
 
-def test_startup_flow_success(
-    capsys: pytest.CaptureFixture, valid_config: Config, alarm_as_ctrl_c
-):
-    """Test the main startup flow, with expected module API calls."""
-    with contextlib.ExitStack() as ctxs:
-        ctxs.enter_context(mock.patch("sys.argv", ["ha_app"]))
-        mock_config = ctxs.enter_context(
-            mock.patch("ha_app.config.Config.from_file", return_value=valid_config)
-        )
-        mock_aws_cls = ctxs.enter_context(mock.patch("ha_app.aws.AWSClient"))
-        mock_aws_client = mock_aws_cls.return_value
-        mock_telem_listen = ctxs.enter_context(mock.patch("ha_app.telem.listen"))
-
-        signal.alarm(1)  # Simulate Ctrl+C from event loop
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
-
-        assert exc_info.value.code == 130
-        mock_config.assert_called_once_with("/etc/ha_app/config.yaml")
-        mock_aws_cls.assert_called_once()
-        mock_aws_client.get_indexed_eni.assert_called_once_with(1)
-        mock_aws_client.get_route_table.assert_called_once_with("rtb-55555")
-        mock_aws_client.get_eni.assert_called_once_with("eni-66666")
-        mock_telem_listen.assert_called_once()
+class _CallCounter:
+    """Cheap callable stand-in for a Mock, just counting calls."""
 
-    stderr = capsys.readouterr().err
-    assert re.search(r"INFO.*Exiting on Ctrl\+C\n", stderr)
+    def __init__(self) -> None:
+        self.calls = 0
 
+    def __call__(self, *args, **kwargs) -> None:
+        self.calls += 1
 
-def test_config_parse_error(capsys: pytest.CaptureFixture):
-    """Test hitting an error at config parsing."""
-    with contextlib.ExitStack() as ctxs:
-        ctxs.enter_context(mock.patch("sys.argv", ["ha_app"]))
-        mock_config = ctxs.enter_context(
-            mock.patch("ha_app.config.Config.from_file", side_effect=FileNotFoundError)
-        )
-        mock_aws_client = ctxs.enter_context(mock.patch("ha_app.aws.AWSClient"))
-        mock_telem_listen = ctxs.enter_context(mock.patch("ha_app.telem.listen"))
-
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
-
-        assert exc_info.value.code == 2
-        mock_config.assert_called_once_with("/etc/ha_app/config.yaml")
-        mock_aws_client.assert_not_called()
-        mock_telem_listen.assert_not_called()
 
-    stderr = capsys.readouterr().err
-    assert re.search(r"ERROR.*Initialisation error:\n", stderr)
-    assert "\nInitError: Error reading config file\n" in stderr
-    assert "\nFileNotFoundError\n" in stderr
-
-
-def test_unexpected_error_exit(capsys: pytest.CaptureFixture, valid_config: Config):
-    """
-    Test an unexpected error causing the main thread to exit.
-
-    The error is injected when the consistency checks start, after the main
-    initialisation flow has completed.
-    """
-    with contextlib.ExitStack() as ctxs:
-        ctxs.enter_context(mock.patch("sys.argv", ["ha_app"]))
-        mock_thread_pool = mock.Mock()
-        ctxs.enter_context(
-            mock.patch(
-                "concurrent.futures.ThreadPoolExecutor", return_value=mock_thread_pool
-            )
-        )
-        mock_config = ctxs.enter_context(
-            mock.patch("ha_app.config.Config.from_file", return_value=valid_config)
-        )
-        mock_subprocess = ctxs.enter_context(mock.patch("subprocess.check_output"))
-        mock_aws_client = ctxs.enter_context(mock.patch("ha_app.aws.AWSClient"))
-        mock_server = mock.Mock()
-        mock_telem_listen = ctxs.enter_context(
-            mock.patch("ha_app.telem.listen", return_value=mock_server)
-        )
-        mock_sleep = ctxs.enter_context(
-            mock.patch(
-                "time.sleep", side_effect=Exception("Mock time.sleep() exception")
-            )
-        )
-
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
-
-        assert exc_info.value.code == 1
-
-        mock_config.assert_called_once()
-        mock_subprocess.assert_called_once()
-        mock_aws_client.assert_called_once()
-        mock_telem_listen.assert_called_once()
-        mock_sleep.assert_called_once()
-        # Check cleanup was performed.
-        mock_thread_pool.shutdown.assert_called_once()
-        mock_server.stop.assert_called_once()
-
-    stderr = capsys.readouterr().err
-    assert re.search(r"ERROR.*Exiting on unexpected error:\n", stderr)
-    assert "\nException: Mock time.sleep() exception\n" in stderr
-
-
-def test_get_actions_error(capsys: pytest.CaptureFixture, valid_config: Config):
-    """Test hitting an error getting actions from config."""
-    with contextlib.ExitStack() as ctxs:
-        ctxs.enter_context(mock.patch("sys.argv", ["ha_app"]))
-        mock_config = ctxs.enter_context(
-            mock.patch("ha_app.config.Config.from_file", return_value=valid_config)
-        )
-        mock_aws_client = ctxs.enter_context(
-            mock.patch(
-                "ha_app.aws.AWSClient",
-                side_effect=Exception("Mock AWSClient exception"),
-            )
-        )
-        mock_telem_listen = ctxs.enter_context(mock.patch("ha_app.telem.listen"))
-
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
-
-        assert exc_info.value.code == 2
-        mock_config.assert_called_once_with("/etc/ha_app/config.yaml")
-        mock_aws_client.assert_called_once()
-        mock_telem_listen.assert_not_called()
-
-    stderr = capsys.readouterr().err
-    assert re.search(r"ERROR.*Initialisation error:\n", stderr)
-    assert "\nInitError: Error validating config: Mock AWSClient exception\n" in stderr
-    assert "\nException: Mock AWSClient exception\n" in stderr
-
-
-def test_telem_listen_error(capsys: pytest.CaptureFixture, valid_config: Config):
-    """Test hitting an error calling telem.listen()."""
-    with contextlib.ExitStack() as ctxs:
-        ctxs.enter_context(mock.patch("sys.argv", ["ha_app"]))
-        mock_config = ctxs.enter_context(
-            mock.patch("ha_app.config.Config.from_file", return_value=valid_config)
-        )
-        mock_aws_client = ctxs.enter_context(mock.patch("ha_app.aws.AWSClient"))
-        mock_telem_listen = ctxs.enter_context(
-            mock.patch(
-                "ha_app.telem.listen",
-                side_effect=Exception("Mock telem.listen() exception"),
-            )
-        )
+@pytest.fixture
+def startup_mocks(
+    monkeypatch: pytest.MonkeyPatch, valid_config: Config
+) -> SimpleNamespace:
+    """Mock out the dependencies of the main startup flow."""
+    mocks = SimpleNamespace(
+        thread_pool=SimpleNamespace(shutdown=_CallCounter()),
+        telem_server=SimpleNamespace(stop=_CallCounter()),
+        config=mock.Mock(return_value=valid_config),
+        subprocess=mock.Mock(),
+        aws_cls=mock.Mock(),
+        telem_listen=mock.Mock(),
+        sleep=mock.Mock(side_effect=KeyboardInterrupt),
+    )
+    mocks.telem_listen.return_value = mocks.telem_server
+    monkeypatch.setattr(__main__, "THREAD_POOL", mocks.thread_pool)
+    monkeypatch.setattr(__main__, "TELEM_SERVER", None)
+    monkeypatch.setattr(Config, "from_file", mocks.config)
+    monkeypatch.setattr(subprocess, "check_output", mocks.subprocess)
+    monkeypatch.setattr("ha_app.aws.AWSClient", mocks.aws_cls)
+    monkeypatch.setattr("ha_app.telem.listen", mocks.telem_listen)
+    monkeypatch.setattr(time, "sleep", mocks.sleep)
+    return mocks
+
+
+class StartupTestParams(typing.NamedTuple):
+    config_side_effect: type[Exception] | None = None
+    aws_side_effect: Exception | None = None
+    telem_side_effect: Exception | None = None
+    sleep_side_effect: BaseException | type[BaseException] = KeyboardInterrupt
+    exp_code: int = 130
+    exp_aws_called: bool = True
+    exp_telem_called: bool = True
+    exp_stderr: tuple[str, ...] = ()
+
+
+startup_testcases = {
+    "success": StartupTestParams(
+        exp_stderr=(r"INFO.*Exiting on Ctrl\+C\n",),
+    ),
+    "config_parse_error": StartupTestParams(
+        config_side_effect=FileNotFoundError,
+        exp_code=2,
+        exp_aws_called=False,
+        exp_telem_called=False,
+        exp_stderr=(
+            r"ERROR.*Initialisation error:\n",
+            r"\nha_app\.__main__\.InitError: Error reading config file\n",
+            r"\nFileNotFoundError\n",
+        ),
+    ),
+    # An unexpected error causing the main thread to exit, injected when the
+    # consistency checks start, after initialisation has completed.
+    "unexpected_error_exit": StartupTestParams(
+        sleep_side_effect=Exception("Mock time.sleep() exception"),
+        exp_code=1,
+        exp_stderr=(
+            r"ERROR.*Exiting on unexpected error:\n",
+            r"\nException: Mock time\.sleep\(\) exception\n",
+        ),
+    ),
+    "get_actions_error": StartupTestParams(
+        aws_side_effect=Exception("Mock AWSClient exception"),
+        exp_code=2,
+        exp_telem_called=False,
+        exp_stderr=(
+            r"ERROR.*Initialisation error:\n",
+            r"\nha_app\.__main__\.InitError: "
+            r"Error validating config: Mock AWSClient exception\n",
+            r"\nException: Mock AWSClient exception\n",
+        ),
+    ),
+    "telem_listen_error": StartupTestParams(
+        telem_side_effect=Exception("Mock telem.listen() exception"),
+        exp_code=2,
+        exp_stderr=(
+            r"ERROR.*Initialisation error:\n",
+            r"\nha_app\.__main__\.InitError: Error starting gRPC telemetry server\n",
+            r"\nException: Mock telem.listen\(\) exception\n",
+        ),
+    ),
+}
 
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
 
-        assert exc_info.value.code == 2
-        mock_config.assert_called_once_with("/etc/ha_app/config.yaml")
-        mock_aws_client.assert_called_once()
-        mock_telem_listen.assert_called_once()
+@parametrize_with_namedtuples(startup_testcases)
+def test_startup_flow(
+    capsys: pytest.CaptureFixture,
+    startup_mocks: SimpleNamespace,
+    config_side_effect: type[Exception] | None,
+    aws_side_effect: Exception | None,
+    telem_side_effect: Exception | None,
+    sleep_side_effect: BaseException | type[BaseException],
+    exp_code: int,
+    exp_aws_called: bool,
+    exp_telem_called: bool,
+    exp_stderr: tuple[str, ...],
+):
+    """Test the main startup flow, in success and error cases."""
+    startup_mocks.config.side_effect = config_side_effect
+    startup_mocks.aws_cls.side_effect = aws_side_effect
+    startup_mocks.telem_listen.side_effect = telem_side_effect
+    startup_mocks.sleep.side_effect = sleep_side_effect
+
+    with pytest.raises(SystemExit) as exc_info:
+        __main__.run([])
+
+    assert exc_info.value.code == exp_code
+    startup_mocks.config.assert_called_once_with("/etc/ha_app/config.yaml")
+    assert startup_mocks.aws_cls.called is exp_aws_called
+    assert startup_mocks.telem_listen.called is exp_telem_called
+    if exp_aws_called and aws_side_effect is None:
+        # Check the registered actions were validated against AWS.
+        aws_client = startup_mocks.aws_cls.return_value
+        startup_mocks.subprocess.assert_called_once()
+        aws_client.get_indexed_eni.assert_called_once_with(1)
+        aws_client.get_route_table.assert_called_once_with("rtb-55555")
+        aws_client.get_eni.assert_called_once_with("eni-66666")
+    if exp_code != 2:
+        # shutdown_cleanup() runs on Ctrl+C and unexpected errors.
+        assert startup_mocks.thread_pool.shutdown.calls == 1
+        assert startup_mocks.telem_server.stop.calls == 1
 
     stderr = capsys.readouterr().err
-    assert re.search(r"ERROR.*Initialisation error:\n", stderr)
-    assert "\nInitError: Error starting gRPC telemetry server\n" in stderr
-    assert "\nException: Mock telem.listen() exception\n" in stderr
+    for pattern in exp_stderr:
+        assert re.search(pattern, stderr), pattern
 
 
 def test_help_output():
     """Test that help output is supported."""
-    with mock.patch("sys.argv", ["ha_app", "--help"]):
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
+    with pytest.raises(SystemExit) as exc_info:
+        __main__.run(["--help"])
     assert exc_info.value.code == 0
 
 
 def test_version_output(capsys: pytest.CaptureFixture):
     """Test getting the app version."""
-    with mock.patch("sys.argv", ["ha_app", "--version"]):
-        with pytest.raises(SystemExit) as exc_info:
-            runpy.run_module("ha_app", run_name="__main__")
+    with pytest.raises(SystemExit) as exc_info:
+        __main__.run(["--version"])
     assert exc_info.value.code == 0
     assert capsys.readouterr().out.rstrip() == __main__.__version__
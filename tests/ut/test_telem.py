@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
+import typing
+from types import SimpleNamespace
 from unittest import mock
 
 import google.protobuf.message
@@ -23,6 +26,7 @@ from ha_app import telem
 from ha_app.gpb.cisco_grpc_dialout_pb2 import MdtDialoutArgs
 from ha_app.gpb.telemetry_pb2 import Telemetry, TelemetryField
 from ha_app.types import VRRPEvent, VRRPSession, VRRPState
+from tests.utils import parametrize_with_namedtuples
 
 
 @pytest.fixture
@@ -30,6 +34,18 @@ def grpc_context() -> mock.Mock:
     return mock.Mock(peer=mock.Mock(return_value="ipv4:1.2.3.4:56789"))
 
 
+@pytest.fixture
+def vrrp_harness() -> SimpleNamespace:
+    """A VRRPServicer wired up to fresh handler mocks."""
+    msg_handler = mock.Mock()
+    disconnect_handler = mock.Mock()
+    return SimpleNamespace(
+        servicer=telem.VRRPServicer(msg_handler, disconnect_handler),
+        msg_handler=msg_handler,
+        disconnect_handler=disconnect_handler,
+    )
+
+
 def _create_msg_from_telemetry(telem_msg: Telemetry) -> MdtDialoutArgs:
     return MdtDialoutArgs(ReqId=1, data=telem_msg.SerializePartialToString())
 
@@ -46,6 +62,15 @@ def _create_msg_from_gpbkv(gpbkv: list[TelemetryField]) -> MdtDialoutArgs:
     return _create_msg_from_telemetry(telem_msg)
 
 
+@functools.lru_cache(maxsize=None)
+def _create_path_msg(encoding_path: str) -> MdtDialoutArgs:
+    """Create a telemetry message with the given encoding path, cached."""
+    return _create_msg_from_telemetry(Telemetry(encoding_path=encoding_path))
+
+
+# Cached since tests repeat the same few (intf_name, vrid, state) triples and
+# protobuf encoding is comparatively expensive; messages are never mutated.
+@functools.lru_cache(maxsize=None)
 def _create_msg(intf_name: str, vrid: int, state: str) -> MdtDialoutArgs:
     """Create a telemetry message to be sent into the MdtDialout RPC."""
     gpbkv_msg = TelemetryField(
@@ -86,161 +111,169 @@ def _create_msg(intf_name: str, vrid: int, state: str) -> MdtDialoutArgs:
     return _create_msg_from_gpbkv([gpbkv_msg])
 
 
-def test_vrrp_single_msg_active(grpc_context: mock.Mock):
-    """Test a single 'active' message being sent."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-
-    grpc_servicer.MdtDialout(
-        iter([_create_msg("test-intf", 1, "master")]),
-        grpc_context,
-    )
-
-    msg_handler.assert_called_once_with(
-        VRRPEvent(VRRPSession("test-intf", 1), VRRPState.ACTIVE)
-    )
-    disconnect_handler.assert_called_once()
-
-
-def test_vrrp_single_msg_inactive(grpc_context: mock.Mock):
-    """Test a single 'inactive' message being sent."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-
-    grpc_servicer.MdtDialout(
-        iter([_create_msg("test-intf", 1, "backup")]),
-        grpc_context,
-    )
+class SingleMsgTestParams(typing.NamedTuple):
+    msg: MdtDialoutArgs
+    exp_event: VRRPEvent | None = None  # None means no event expected
+    exp_log_records: int = 0  # Expected warning-or-above log records
+    exp_exception: type[Exception] | None = None  # Propagates out of the RPC
+
+
+single_msg_testcases = {
+    "active": SingleMsgTestParams(
+        msg=_create_msg("test-intf", 1, "master"),
+        exp_event=VRRPEvent(VRRPSession("test-intf", 1), VRRPState.ACTIVE),
+    ),
+    "inactive": SingleMsgTestParams(
+        msg=_create_msg("test-intf", 1, "backup"),
+        exp_event=VRRPEvent(VRRPSession("test-intf", 1), VRRPState.INACTIVE),
+    ),
+    # An unexpected empty VRRP telemetry message, ignored with a warning.
+    "unexpected_empty_vrrp_msg": SingleMsgTestParams(
+        msg=_create_msg_from_gpbkv([]),
+        exp_log_records=1,
+    ),
+    # An invalid VRRP telemetry message, ignored with a warning.
+    "invalid_vrrp_msg": SingleMsgTestParams(
+        msg=_create_msg_from_gpbkv([TelemetryField()]),
+        exp_log_records=1,
+    ),
+    # A JSON data payload in MdtDialoutArgs, ignored with a warning.
+    "json_msg_payload": SingleMsgTestParams(
+        msg=MdtDialoutArgs(data=b"{}"),
+        exp_log_records=1,
+    ),
+    # An unexpected MdtDialoutArgs data payload, closes the connection.
+    "unexpected_msg_payload": SingleMsgTestParams(
+        msg=MdtDialoutArgs(data=b"foo"),
+        exp_log_records=1,
+        exp_exception=google.protobuf.message.DecodeError,
+    ),
+}
+
+
+@parametrize_with_namedtuples(single_msg_testcases)
+def test_vrrp_single_msg(
+    vrrp_harness: SimpleNamespace,
+    grpc_context: mock.Mock,
+    caplog: pytest.LogCaptureFixture,
+    msg: MdtDialoutArgs,
+    exp_event: VRRPEvent | None,
+    exp_log_records: int,
+    exp_exception: type[Exception] | None,
+):
+    """Test a single message being sent into the MdtDialout RPC."""
+    with caplog.at_level(logging.WARNING, "ha_app.telem"):
+        if exp_exception is not None:
+            with pytest.raises(exp_exception):
+                vrrp_harness.servicer.MdtDialout((msg,), grpc_context)
+        else:
+            vrrp_harness.servicer.MdtDialout((msg,), grpc_context)
 
-    msg_handler.assert_called_once_with(
-        VRRPEvent(VRRPSession("test-intf", 1), VRRPState.INACTIVE)
-    )
-    disconnect_handler.assert_called_once()
+    if exp_event is not None:
+        vrrp_harness.msg_handler.assert_called_once_with(exp_event)
+    else:
+        vrrp_harness.msg_handler.assert_not_called()
+    assert len(caplog.records) == exp_log_records
+    vrrp_harness.disconnect_handler.assert_called_once()
 
 
-def test_vrrp_msg_iterator(grpc_context: mock.Mock):
+def test_vrrp_msg_iterator(vrrp_harness: SimpleNamespace, grpc_context: mock.Mock):
     """Test multiple messages being sent via an iterator."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
 
     def msg_iterator():
-        msg_handler.assert_not_called()
+        vrrp_harness.msg_handler.assert_not_called()
         yield _create_msg("HundredGigE0/0/0/1", 1, "init")
-        msg_handler.assert_called_once_with(
+        vrrp_harness.msg_handler.assert_called_once_with(
             VRRPEvent(VRRPSession("HundredGigE0/0/0/1", 1), VRRPState.INACTIVE)
         )
-        msg_handler.reset_mock()
+        vrrp_harness.msg_handler.reset_mock()
         yield _create_msg("HundredGigE0/0/0/2", 2, "master")
-        msg_handler.assert_called_once_with(
+        vrrp_harness.msg_handler.assert_called_once_with(
             VRRPEvent(VRRPSession("HundredGigE0/0/0/2", 2), VRRPState.ACTIVE)
         )
-        msg_handler.reset_mock()
+        vrrp_harness.msg_handler.reset_mock()
         yield _create_msg("HundredGigE0/0/0/2", 2, "backup")
-        msg_handler.assert_called_once_with(
+        vrrp_harness.msg_handler.assert_called_once_with(
             VRRPEvent(VRRPSession("HundredGigE0/0/0/2", 2), VRRPState.INACTIVE)
         )
-        msg_handler.reset_mock()
-        disconnect_handler.assert_not_called()
+        vrrp_harness.msg_handler.reset_mock()
+        vrrp_harness.disconnect_handler.assert_not_called()
 
-    grpc_servicer.MdtDialout(msg_iterator(), grpc_context)
+    vrrp_harness.servicer.MdtDialout(msg_iterator(), grpc_context)
     # The disconnect happens at the completion of message iteration.
-    disconnect_handler.assert_called_once()
+    vrrp_harness.disconnect_handler.assert_called_once()
 
 
-def test_connection_closed(grpc_context: mock.Mock):
+def test_connection_closed(vrrp_harness: SimpleNamespace, grpc_context: mock.Mock):
     """Test the connection being closed by the client side."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
 
     def msg_iterator():
-        msg_handler.assert_not_called()
+        vrrp_harness.msg_handler.assert_not_called()
         yield _create_msg("HundredGigE0/0/0/1", 1, "init")
-        msg_handler.assert_called_once_with(
+        vrrp_harness.msg_handler.assert_called_once_with(
             VRRPEvent(VRRPSession("HundredGigE0/0/0/1", 1), VRRPState.INACTIVE)
         )
-        msg_handler.reset_mock()
-        disconnect_handler.assert_not_called()
+        vrrp_harness.msg_handler.reset_mock()
+        vrrp_harness.disconnect_handler.assert_not_called()
         raise grpc.RpcError
 
     with pytest.raises(grpc.RpcError):
-        grpc_servicer.MdtDialout(msg_iterator(), grpc_context)
+        vrrp_harness.servicer.MdtDialout(msg_iterator(), grpc_context)
 
     # The disconnect happens when the connection is closed.
-    disconnect_handler.assert_called_once()
-
-
-def test_unexpected_empty_vrrp_msg(
-    grpc_context: mock.Mock, caplog: pytest.LogCaptureFixture
-):
-    """Test an unexpected empty VRRP telemetry message, ignored with a warning."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-    msg = _create_msg_from_gpbkv([])
-
-    with caplog.at_level(logging.WARNING, "ha_app.telem"):
-        grpc_servicer.MdtDialout(iter([msg]), grpc_context)
-
-    assert len(caplog.records) == 1
-    msg_handler.assert_not_called()
-    disconnect_handler.assert_called_once()
+    vrrp_harness.disconnect_handler.assert_called_once()
+
+
+# Messages for test_many_unexpected_telemetry_msg_paths, built once at import
+# time since the encoding is immutable and reruns would repeat the work.
+_UNEXPECTED_PATH_MSGS = tuple(
+    _create_path_msg(p)
+    for p in (
+        "0",  # 10 paths to fill the deque
+        "1",
+        "2",
+        "3",
+        "4",
+        "5",
+        "6",
+        "7",
+        "8",
+        "9",
+        "foo",  # Drop '0' from the deque
+        "foo",  # No warning
+        "2",  # No warning
+        "1",  # No warning
+        "0",  # Warn, back in the deque, drop '1'
+        "1",  # Now warns
+    )
+)
 
 
 def test_unexpected_telemetry_msg_path(
-    grpc_context: mock.Mock, caplog: pytest.LogCaptureFixture
+    vrrp_harness: SimpleNamespace,
+    grpc_context: mock.Mock,
+    caplog: pytest.LogCaptureFixture,
 ):
     """Test an unexpected telemetry message, ignored with a single warning."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-    msg = _create_msg_from_telemetry(
-        Telemetry(encoding_path="Cisco-IOS-XR-infra-syslog-oper:syslog/messages")
-    )
+    msg = _create_path_msg("Cisco-IOS-XR-infra-syslog-oper:syslog/messages")
 
     with caplog.at_level(logging.WARNING, "ha_app.telem"):
-        grpc_servicer.MdtDialout(iter([msg, msg, msg]), grpc_context)
+        vrrp_harness.servicer.MdtDialout((msg, msg, msg), grpc_context)
 
     # Only logged the first time for unexpected encoding path.
     assert len(caplog.records) == 1
-    msg_handler.assert_not_called()
-    disconnect_handler.assert_called_once()
+    vrrp_harness.msg_handler.assert_not_called()
+    vrrp_harness.disconnect_handler.assert_called_once()
 
 
 def test_many_unexpected_telemetry_msg_paths(
-    grpc_context: mock.Mock, caplog: pytest.LogCaptureFixture
+    vrrp_harness: SimpleNamespace,
+    grpc_context: mock.Mock,
+    caplog: pytest.LogCaptureFixture,
 ):
     """Test lots of unexpected telemetry messages."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-    msgs = [
-        _create_msg_from_telemetry(Telemetry(encoding_path=p))
-        for p in (
-            "0",  # 10 paths to fill the deque
-            "1",
-            "2",
-            "3",
-            "4",
-            "5",
-            "6",
-            "7",
-            "8",
-            "9",
-            "foo",  # Drop '0' from the deque
-            "foo",  # No warning
-            "2",  # No warning
-            "1",  # No warning
-            "0",  # Warn, back in the deque, drop '1'
-            "1",  # Now warns
-        )
-    ]
-
     with caplog.at_level(logging.WARNING, "ha_app.telem"):
-        grpc_servicer.MdtDialout(iter(msgs), grpc_context)
+        vrrp_harness.servicer.MdtDialout(_UNEXPECTED_PATH_MSGS, grpc_context)
 
     assert caplog.messages == [
         "Received unexpected telemetry message with path '0' (subsequent messages will be silently dropped)",
@@ -257,54 +290,8 @@ def test_many_unexpected_telemetry_msg_paths(
         "Received unexpected telemetry message with path '0' (subsequent messages will be silently dropped)",
         "Received unexpected telemetry message with path '1' (subsequent messages will be silently dropped)",
     ]
-    msg_handler.assert_not_called()
-    disconnect_handler.assert_called_once()
-
-
-def test_invalid_vrrp_msg(grpc_context: mock.Mock, caplog: pytest.LogCaptureFixture):
-    """Test an invalid VRRP telemetry message, ignored with a warning."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-    msg = _create_msg_from_gpbkv([TelemetryField()])
-
-    with caplog.at_level(logging.WARNING, "ha_app.telem"):
-        grpc_servicer.MdtDialout(iter([msg]), grpc_context)
-
-    assert len(caplog.records) == 1
-    msg_handler.assert_not_called()
-    disconnect_handler.assert_called_once()
-
-
-def test_json_msg_payload(grpc_context: mock.Mock, caplog: pytest.LogCaptureFixture):
-    """Test a JSON data payload in MdtDialoutArgs, ignored with a warning."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-
-    with caplog.at_level(logging.WARNING, "ha_app.telem"):
-        grpc_servicer.MdtDialout(iter([MdtDialoutArgs(data=b"{}")]), grpc_context)
-
-    assert len(caplog.records) == 1
-    msg_handler.assert_not_called()
-    disconnect_handler.assert_called_once()
-
-
-def test_unexpected_msg_payload(
-    grpc_context: mock.Mock, caplog: pytest.LogCaptureFixture
-):
-    """Test an expected MdtDialoutArgs data payload, closes connection."""
-    msg_handler = mock.Mock()
-    disconnect_handler = mock.Mock()
-    grpc_servicer = telem.VRRPServicer(msg_handler, disconnect_handler)
-
-    with caplog.at_level(logging.ERROR, "ha_app.telem"):
-        with pytest.raises(google.protobuf.message.DecodeError):
-            grpc_servicer.MdtDialout(iter([MdtDialoutArgs(data=b"foo")]), grpc_context)
-
-    assert len(caplog.records) == 1
-    msg_handler.assert_not_called()
-    disconnect_handler.assert_called_once()
+    vrrp_harness.msg_handler.assert_not_called()
+    vrrp_harness.disconnect_handler.assert_called_once()
 
 
 def test_listen_api():
@@ -20,20 +20,29 @@ __all__ = (
     "parametrize_with_namedtuples",
 )
 
-import typing
 from pathlib import Path
-from typing import Mapping
+from typing import Any, Iterator, Mapping, Protocol
 
 import pytest
 
 
-ROOT_DIR = Path.cwd()
+# The repo root, anchored to this file rather than the working directory.
+ROOT_DIR = Path(__file__).resolve().parent.parent
 
 Json = dict[None | bool | int | float | str | list["Json"] | dict[str, "Json"]]
 
 
+class _HasFields(Protocol):
+    """Structural type for namedtuple instances."""
+
+    _fields: tuple[str, ...]
+
+    def __iter__(self) -> Iterator[Any]:
+        ...
+
+
 def parametrize_with_namedtuples(
-    testcases: Mapping[str, typing.NamedTuple],
+    testcases: Mapping[str, _HasFields],
 ) -> pytest.MarkDecorator:
     """
     Shorthand for parametrizing a test with a map: ID -> namedtuple of params.
@@ -47,6 +56,6 @@ def parametrize_with_namedtuples(
         The wrapped pytest parametrize mark decorator.
     """
     return pytest.mark.parametrize(
-        list(testcases.values())[0]._fields,
-        [pytest.param(*params, id=tc) for tc, params in testcases.items()],
+        next(iter(testcases.values()))._fields,
+        (pytest.param(*params, id=tc) for tc, params in testcases.items()),
     )